@@ -0,0 +1,51 @@
+"""add imported file shot date
+
+Revision ID: d2f7a4c91e36
+Revises: b8c41e0d7f25
+Create Date: 2025-05-31 10:27:44.961302
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f7a4c91e36"
+down_revision: Union[str, None] = "b8c41e0d7f25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("imported_files", sa.Column("shot_date", sa.Date(), nullable=True))
+    # Files were only imported under a YYYYMMDD name, see parse_shot_date
+    op.execute(
+        """
+        UPDATE imported_files
+        SET shot_date = to_date(left(filename, 8), 'YYYYMMDD')
+        """
+    )
+    op.alter_column("imported_files", "shot_date", nullable=False)
+    op.drop_constraint("imported_files_pkey", "imported_files", type_="primary")
+    op.create_primary_key(
+        "imported_files_pkey", "imported_files", ["sha256", "shot_date"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("imported_files_pkey", "imported_files", type_="primary")
+    # The same content may now be registered for several days
+    op.execute(
+        """
+        DELETE FROM imported_files a
+        USING imported_files b
+        WHERE a.sha256 = b.sha256 AND a.shot_date > b.shot_date
+        """
+    )
+    op.create_primary_key("imported_files_pkey", "imported_files", ["sha256"])
+    op.drop_column("imported_files", "shot_date")
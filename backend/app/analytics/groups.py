@@ -0,0 +1,118 @@
+"""
+Shot group metrics, computed for many groups at once.
+
+Every shot of a request is passed as flat ``x``/``y`` arrays with a group id
+per shot, so all relays and days of a response are measured in one set of
+array operations instead of a Python loop per group. Distances are in mm,
+radii are measured from the group's mean point of impact (MPI).
+"""
+
+from typing import Dict
+
+import numpy as np
+
+GROUP_METRICS = (
+    "mpi_x",  # Mean point of impact
+    "mpi_y",
+    "extreme_spread",  # Largest center to center distance between two shots
+    "width",  # Horizontal and vertical extent
+    "height",
+    "mean_radius",  # Mean distance to the MPI
+    "radial_sd",  # Root mean square distance to the MPI
+    "r50",  # Radius around the MPI holding 50% / 90% of the shots
+    "r90",
+)
+
+# Pairwise distances are built for this many shot pairs at a time at most
+_PAIR_BUDGET = 1 << 21
+
+
+def _percentile(
+    sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float
+) -> np.ndarray:
+    """Per group percentile of values sorted within each group, like np.percentile."""
+    position = (counts - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts - 1)
+    low = sorted_values[starts + lower]
+    high = sorted_values[starts + upper]
+    return low + (high - low) * (position - lower)
+
+
+def _large_group_spread(x: np.ndarray, y: np.ndarray) -> float:
+    """Largest pairwise distance of one group too large for a full pair matrix."""
+    # Blocks of shots are measured against the whole group, rows x len(x)
+    # pairs at a time
+    rows = max(1, _PAIR_BUDGET // len(x))
+    largest = 0.0
+    for first in range(0, len(x), rows):
+        squared = (x[first : first + rows, None] - x) ** 2 + (
+            y[first : first + rows, None] - y
+        ) ** 2
+        largest = max(largest, float(squared.max()))
+    return largest**0.5
+
+
+def _extreme_spread(
+    x: np.ndarray, y: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Largest pairwise distance per group, from shots sorted by group."""
+    spread = np.zeros(len(counts))
+    # Groups of the same size are stacked into (groups, size) arrays, so the
+    # pair matrices need no padding; chunks keep them within budget
+    for size in np.unique(counts).tolist():
+        groups = np.flatnonzero(counts == size)
+        if size * size > _PAIR_BUDGET:
+            for group in groups.tolist():
+                spread[group] = _large_group_spread(
+                    x[starts[group] : starts[group] + size],
+                    y[starts[group] : starts[group] + size],
+                )
+            continue
+        chunk = _PAIR_BUDGET // (size * size)
+        for first in range(0, len(groups), chunk):
+            chunk_groups = groups[first : first + chunk]
+            index = starts[chunk_groups, None] + np.arange(size)
+            px, py = x[index], y[index]
+            squared = (px[:, :, None] - px[:, None, :]) ** 2 + (
+                py[:, :, None] - py[:, None, :]
+            ) ** 2
+            spread[chunk_groups] = np.sqrt(squared.max(axis=(1, 2)))
+    return spread
+
+
+def group_metrics(
+    x: np.ndarray, y: np.ndarray, group_ids: np.ndarray, groups: int
+) -> Dict[str, np.ndarray]:
+    """
+    Metrics of ``groups`` shot groups, one array of length ``groups`` per name
+    in GROUP_METRICS. ``group_ids`` maps each shot to a group in
+    ``range(groups)``; every group needs at least one shot.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+
+    counts = np.bincount(group_ids, minlength=groups)
+    if (counts == 0).any():
+        raise ValueError("every group needs at least one shot")
+    mpi_x = np.bincount(group_ids, x, groups) / counts
+    mpi_y = np.bincount(group_ids, y, groups) / counts
+    radius = np.hypot(x - mpi_x[group_ids], y - mpi_y[group_ids])
+
+    # Shots sorted by group, then by radius within the group
+    order = np.lexsort((radius, group_ids))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    xs, ys, radius_sorted = x[order], y[order], radius[order]
+
+    return {
+        "mpi_x": mpi_x,
+        "mpi_y": mpi_y,
+        "extreme_spread": _extreme_spread(xs, ys, starts, counts),
+        "width": np.maximum.reduceat(xs, starts) - np.minimum.reduceat(xs, starts),
+        "height": np.maximum.reduceat(ys, starts) - np.minimum.reduceat(ys, starts),
+        "mean_radius": np.bincount(group_ids, radius, groups) / counts,
+        "radial_sd": np.sqrt(np.bincount(group_ids, radius**2, groups) / counts),
+        "r50": _percentile(radius_sorted, starts, counts, 0.5),
+        "r90": _percentile(radius_sorted, starts, counts, 0.9),
+    }
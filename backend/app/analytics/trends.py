@@ -0,0 +1,95 @@
+"""
+Rolling score trends over daily totals.
+
+A TrendSeries keeps per calendar day match shot totals (count, sum of scores
+and sum of squared scores) and their prefix sums, so any trailing window is
+two lookups per day. Days can be appended or replaced from a date onwards;
+only the prefix sums from that date are recomputed.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+TREND_WINDOWS = (7, 30, 90)
+
+
+class TrendSeries:
+    def __init__(self):
+        self.first = None  # Ordinal of the first calendar day held
+        # Rows: shots, sum of scores, sum of squared scores, one column per day
+        self.totals = np.zeros((3, 0))
+        # cumulative[:, i] is the sum of totals[:, :i]
+        self.cumulative = np.zeros((3, 1))
+
+    def __len__(self) -> int:
+        return self.totals.shape[1]
+
+    def _reserve(self, first: int, last: int) -> None:
+        if self.first is None:
+            self.first = first
+        if first < self.first:
+            pad = np.zeros((3, self.first - first))
+            self.totals = np.concatenate((pad, self.totals), axis=1)
+            self.cumulative = np.concatenate((pad, self.cumulative), axis=1)
+            self.first = first
+        grow = last - self.first + 1 - len(self)
+        if grow > 0:
+            self.totals = np.concatenate((self.totals, np.zeros((3, grow))), axis=1)
+            tail = np.repeat(self.cumulative[:, -1:], grow, axis=1)
+            self.cumulative = np.concatenate((self.cumulative, tail), axis=1)
+
+    def replace_from(
+        self, since: date, days: Iterable[Tuple[date, int, float, float]]
+    ) -> None:
+        """
+        Replace everything from ``since`` on with ``days``, rows of
+        (day, shots, sum of scores, sum of squared scores) on or after it.
+        """
+        days = list(days)
+        since = since.toordinal()
+        ordinals = [day.toordinal() for day, *_ in days]
+        self._reserve(min([since, *ordinals]), max([since, *ordinals]))
+
+        start = since - self.first
+        self.totals[:, start:] = 0
+        if days:
+            values = np.array([row[1:] for row in days], dtype=np.float64).T
+            self.totals[:, np.array(ordinals) - self.first] = values
+        self.cumulative[:, start + 1 :] = self.cumulative[:, start : start + 1] + (
+            np.cumsum(self.totals[:, start:], axis=1)
+        )
+
+    def rolling(self, since: date) -> Dict[str, np.ndarray]:
+        """
+        Daily and trailing window stats for each day with shots from
+        ``since`` on. Means are per shot, NaN without shots; standard
+        deviations are the sample SD of the window's shot scores, NaN below
+        two shots.
+        """
+        first = self.first if self.first is not None else since.toordinal()
+        start = max(since.toordinal() - first, 0)
+        index = start + np.flatnonzero(self.totals[0, start:])
+        shots, score, _ = self.totals[:, index]
+        result = {
+            "day": index + first,
+            "total_shots": shots,
+            "average_score": score / shots,
+        }
+        end = index + 1
+        for window in TREND_WINDOWS:
+            n, s, s2 = (
+                self.cumulative[:, end]
+                - self.cumulative[:, np.maximum(end - window, 0)]
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = s / n
+                # With one shot the numerator is rounding noise over zero,
+                # not an SD
+                variance = (s2 - s * s / n) / (n - 1)
+            result[f"mean_{window}"] = np.where(n >= 1, mean, np.nan)
+            result[f"sd_{window}"] = np.where(
+                n >= 2, np.sqrt(np.maximum(variance, 0)), np.nan
+            )
+        return result
@@ -0,0 +1,51 @@
+"""
+JSON encoding for responses built as plain dicts (FAST_SERIALIZATION).
+
+Uses orjson when it is installed and the standard library otherwise. Both
+produce the same bytes as FastAPI's default JSONResponse for the values the
+shot endpoints return: compact separators, non-ASCII kept, ISO dates and times.
+"""
+
+import json
+from datetime import date, time
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.metrics.timing import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    if orjson is not None:
+        # Dates and times go through isoformat too, orjson formats some
+        # microsecond values differently from the standard library
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class TimedJSONResponse(JSONResponse):
+    """FastAPI's JSONResponse, with encoding counted as serialization time."""
+
+    def render(self, content: Any) -> bytes:
+        with timed_serialization():
+            return super().render(content)
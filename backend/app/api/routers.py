@@ -0,0 +1,77 @@
+"""
+Router registry and lazy inclusion.
+
+Each router pulls in its crud modules, the SQLModel models and NumPy when it
+is imported. With ``LAZY_STARTUP`` the app starts without them and
+``LazyRouterMiddleware`` imports a router the first time a request falls
+under its prefix, so a Lambda cold start only pays for what it serves.
+"""
+
+import importlib
+from typing import NamedTuple
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class RouterSpec(NamedTuple):
+    module: str
+    prefix: str
+    tag: str
+
+
+ROUTERS = (
+    RouterSpec("app.api.v1.import_file", "/api/v1/import", "Import"),
+    RouterSpec("app.api.v1.login", "/api/v1", "login"),
+    RouterSpec("app.api.v1.athlete", "/api/v1/athlete", "Athletes"),
+    RouterSpec("app.api.v1.shot", "/api/v1/shots", "Shots"),
+    RouterSpec("app.api.v1.leaderboard", "/api/v1/leaderboard", "Leaderboard"),
+)
+
+
+def include_router(app: FastAPI, spec: RouterSpec) -> None:
+    router = importlib.import_module(spec.module).router
+    app.include_router(router, prefix=spec.prefix, tags=[spec.tag])
+
+
+def include_routers(app: FastAPI, specs=ROUTERS) -> None:
+    for spec in specs:
+        include_router(app, spec)
+
+
+class LazyRouterMiddleware:
+    """Include the router owning a request path before the request is routed."""
+
+    def __init__(self, app: ASGIApp, routers=ROUTERS, docs_paths=()):
+        self.app = app
+        self.routers = tuple(routers)
+        # Longest prefix first so /api/v1/shots is not claimed by /api/v1
+        self.by_prefix = sorted(
+            self.routers, key=lambda spec: len(spec.prefix), reverse=True
+        )
+        self.pending = set(self.routers)
+        self.docs_paths = set(docs_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.pending and scope["type"] in ("http", "websocket"):
+            self.load(scope["app"], scope["path"])
+        await self.app(scope, receive, send)
+
+    def owner(self, path: str):
+        for spec in self.by_prefix:
+            if path == spec.prefix or path.startswith(spec.prefix + "/"):
+                return spec
+        return None
+
+    def load(self, app: FastAPI, path: str) -> None:
+        if path in self.docs_paths:
+            matched = self.pending
+        else:
+            matched = {self.owner(path)} & self.pending
+        if not matched:
+            return
+        # Keep the eager registration order so the OpenAPI schema matches
+        for spec in sorted(matched, key=self.routers.index):
+            include_router(app, spec)
+            self.pending.discard(spec)
+        app.openapi_schema = None
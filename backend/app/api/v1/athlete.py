@@ -20,8 +20,8 @@ router = APIRouter()
     response_model=AthleteRead,
     dependencies=[Depends(get_current_superuser)],
 )
-def add_athlete(athlete: AthleteCreate):
-    return create_athlete(athlete)
+async def add_athlete(athlete: AthleteCreate):
+    return await create_athlete(athlete)
 
 
 @router.get(
@@ -29,20 +29,20 @@ def add_athlete(athlete: AthleteCreate):
     response_model=List[AthleteRead],
     dependencies=[Depends(get_current_superuser)],
 )
-def list_athletes():
-    return get_all_athletes()
+async def list_athletes():
+    return await get_all_athletes()
 
 
 @router.get(
     "/{athlete_id}",
     response_model=AthleteRead,
 )
-def read_athlete(athlete_id: int, user: User = Depends(get_current_active_user)):
+async def read_athlete(athlete_id: int, user: User = Depends(get_current_active_user)):
     if user.athlete_id != athlete_id and not user.is_admin:
         raise HTTPException(
             status_code=403, detail="Only admins can access other athletes info"
         )
-    athlete = get_athlete_by_id(athlete_id)
+    athlete = await get_athlete_by_id(athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Athlete not found")
     return athlete
@@ -53,8 +53,8 @@ def read_athlete(athlete_id: int, user: User = Depends(get_current_active_user))
     response_model=AthleteRead,
     dependencies=[Depends(get_current_superuser)],
 )
-def update_athlete_endpoint(athlete_id: int, update: AthleteUpdate):
-    updated = update_athlete(athlete_id, update)
+async def update_athlete_endpoint(athlete_id: int, update: AthleteUpdate):
+    updated = await update_athlete(athlete_id, update)
     if not updated:
         raise HTTPException(status_code=404, detail="Athlete not found")
     return updated
@@ -64,8 +64,8 @@ def update_athlete_endpoint(athlete_id: int, update: AthleteUpdate):
     "/{athlete_id}",
     dependencies=[Depends(get_current_superuser)],
 )
-def delete_athlete_endpoint(athlete_id: int):
-    success = delete_athlete(athlete_id)
+async def delete_athlete_endpoint(athlete_id: int):
+    success = await delete_athlete(athlete_id)
     if not success:
         raise HTTPException(status_code=404, detail="Athlete not found")
     return {"ok": True}
@@ -1,6 +1,12 @@
+import uuid as uuid_pkg
 from typing import List
 
-from app.crud.import_crud import load_csv_file
+from app.crud.import_crud import load_csv_file, load_csv_files
+from app.crud.job_crud import (
+    ImportJobStatus,
+    enqueue_import_job,
+    get_import_job_status,
+)
 from fastapi import APIRouter, File, HTTPException, UploadFile
 
 router = APIRouter()
@@ -12,17 +18,21 @@ async def upload_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
 
     try:
-        await load_csv_file(file)
-        return {"message": "Upload successful"}
+        result = await load_csv_file(file)
+        message = "File already imported" if result.duplicate else "Upload successful"
+        return {"message": message, **result.model_dump()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/csv/multi")
 async def upload_csv_multi(files: List[UploadFile] = File(...)):
+    csv_files = [file for file in files if file.filename.endswith(".csv")]
+    loaded = dict(zip(map(id, csv_files), await load_csv_files(csv_files)))
+
     results = []
     for file in files:
-        if not file.filename.endswith(".csv"):
+        if id(file) not in loaded:
             results.append(
                 {
                     "filename": file.filename,
@@ -31,11 +41,30 @@ async def upload_csv_multi(files: List[UploadFile] = File(...)):
                 }
             )
             continue
-        try:
-            await load_csv_file(file)
-            results.append({"filename": file.filename, "status": "success"})
-        except Exception as e:
+        result = loaded[id(file)]
+        if isinstance(result, Exception):
             results.append(
-                {"filename": file.filename, "status": "error", "detail": str(e)}
+                {"filename": file.filename, "status": "error", "detail": str(result)}
             )
+        else:
+            results.append({**result.model_dump(), "status": "success"})
     return {"results": results}
+
+
+@router.post("/jobs", status_code=202)
+async def enqueue_csv_import(files: List[UploadFile] = File(...)):
+    """
+    Store the files for app.commands.import_worker and return at once, for
+    batches that would outlast the request timeout of /csv/multi. Poll
+    /jobs/{job_id} for progress and per-file results.
+    """
+    job_id = await enqueue_import_job(files)
+    return {"job_id": job_id, "files": len(files)}
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJobStatus)
+async def get_csv_import_job(job_id: uuid_pkg.UUID):
+    status = await get_import_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return status
@@ -0,0 +1,51 @@
+from typing import Literal
+
+from app.crud.athlete_crud import get_athlete_by_id
+from app.crud.leaderboard_crud import get_leaderboard, get_leaderboard_rank
+from app.db.models.user_model import User
+from app.schemas.leaderboard import Leaderboard, LeaderboardRow
+from app.security.user_auth import get_current_active_user
+from fastapi import APIRouter, Depends, Query
+
+router = APIRouter()
+
+
+def leaderboard_row(rank: int, entry, athlete=None) -> LeaderboardRow:
+    return LeaderboardRow(
+        rank=rank,
+        athlete_id=entry.athlete_id,
+        first_name=athlete.first_name if athlete else None,
+        last_name=athlete.last_name if athlete else None,
+        best_relay=entry.best_relay,
+        average_score=entry.average_score,
+        total_shots=entry.total_shots,
+    )
+
+
+@router.get("", response_model=Leaderboard)
+async def api_get_leaderboard(
+    period: str = Query("all", pattern=r"^(all|\d{4}|\d{4}-\d{2})$"),
+    metric: Literal["best_relay", "average_score"] = "best_relay",
+    limit: int = Query(10, ge=1, le=100),
+    user: User = Depends(get_current_active_user),
+):
+    """
+    Top athletes of a period: "all", a year ("2025") or a month ("2025-05").
+    Athletes with the same value share a rank.
+    """
+    entries = []
+    for position, (entry, athlete) in enumerate(
+        await get_leaderboard(period, metric, limit), start=1
+    ):
+        value = getattr(entry, metric)
+        if not entries or value != getattr(entries[-1], metric):
+            rank = position
+        entries.append(leaderboard_row(rank, entry, athlete))
+
+    me = None
+    if user.athlete_id is not None:
+        standing = await get_leaderboard_rank(period, metric, user.athlete_id)
+        if standing is not None:
+            rank, entry = standing
+            me = leaderboard_row(rank, entry, await get_athlete_by_id(entry.athlete_id))
+    return Leaderboard(period=period, metric=metric, entries=entries, me=me)
@@ -8,6 +8,7 @@ from app.security.user_auth import (
     get_current_active_user,
     get_current_superuser,
 )
+from app.security.user_cache import user_cache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
@@ -24,7 +25,7 @@ class Token(BaseModel):
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,9 +51,15 @@ async def read_users_me(
 async def add_user(
     user: UserCreate,
 ):
-    created_user = create_user(user)
+    created_user = await create_user(user)
     return UserBase(
         **created_user.model_dump(
             include={"username", "email", "full_name", "athlete_id"}
         )
     )
+
+
+@router.get("/users/cache", dependencies=[Depends(get_current_superuser)])
+async def read_user_cache_stats():
+    """Hit and miss counters of the token to user cache."""
+    return user_cache.stats()
@@ -1,44 +1,164 @@
-from datetime import date
-from typing import List
+from datetime import date, time
+from typing import List, Optional
 
+from app.cache.responses import cached_body, cached_json
 from app.crud.shots_crud import (
     DayStats,
     RelayStats,
     get_recent_scores,
+    get_recent_summaries,
+    get_shot_coordinates,
     get_shots_by_day,
     get_shots_by_set,
     get_stats,
 )
+from app.crud.trend_crud import TrendPoint, get_trend
 from app.db.models.user_model import User
+from app.events.stream import shot_stream
 from app.security.user_auth import get_current_active_user
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 
+# Packed shot times are uint32 centiseconds from the first day
+MAX_COORDINATE_DAYS = 366
+
 
 @router.get("/recent-scores", response_model=List[DayStats])
 async def api_get_recent_scores(
-    days: int = 10, user: User = Depends(get_current_active_user)
+    request: Request,
+    days: int = 10,
+    detail: bool = True,
+    user: User = Depends(get_current_active_user),
 ):
-    return get_recent_scores(user.athlete_id, days)
+    # Without detail, days and relay totals come from the daily rollups and
+    # the shot lists are left empty
+    load = get_recent_scores if detail else get_recent_summaries
+    # The window ends today, so the key rolls over at midnight
+    key = ("recent-scores", days, detail, date.today())
+    return await cached_json(
+        request, user.athlete_id, key, lambda: load(user.athlete_id, days)
+    )
 
 
 @router.get("/stats")
 async def api_get_stats(
     period: str = "10days", user: User = Depends(get_current_active_user)
 ):
-    return get_stats(user.athlete_id, period)
+    return await get_stats(user.athlete_id, period)
+
+
+@router.get("/trend", response_model=List[TrendPoint])
+async def api_get_trend(
+    request: Request,
+    days: int = Query(365, ge=1, le=3650),
+    user: User = Depends(get_current_active_user),
+):
+    """Daily averages with rolling 7/30/90-day means and SDs, for charts."""
+    return await cached_json(
+        request,
+        user.athlete_id,
+        ("trend", days, date.today()),
+        lambda: get_trend(user.athlete_id, days),
+    )
 
 
 @router.get("/by-day", response_model=DayStats)
 async def api_get_shots_by_day(
-    date_: date, user: User = Depends(get_current_active_user)
+    request: Request, date_: date, user: User = Depends(get_current_active_user)
 ):
-    return get_shots_by_day(user.athlete_id, date_)
+    return await cached_json(
+        request,
+        user.athlete_id,
+        ("by-day", date_),
+        lambda: get_shots_by_day(user.athlete_id, date_),
+    )
+
+
+@router.get(
+    "/coordinates",
+    response_class=Response,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+)
+async def api_get_shot_coordinates(
+    request: Request,
+    date_: date,
+    end_date: Optional[date] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """
+    Shots from ``date_`` to ``end_date`` (default the same day) as packed
+    little-endian arrays, see COORDINATES_HEADER in shots_crud for the layout.
+    """
+    end_date = end_date or date_
+    if end_date < date_:
+        raise HTTPException(status_code=400, detail="end_date is before date_")
+    if (end_date - date_).days >= MAX_COORDINATE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_COORDINATE_DAYS} days can be requested",
+        )
+    return await cached_body(
+        request,
+        user.athlete_id,
+        ("coordinates", date_, end_date),
+        lambda: get_shot_coordinates(user.athlete_id, date_, end_date),
+        media_type="application/octet-stream",
+    )
 
 
 @router.get("/by-set", response_model=List[RelayStats])
 async def api_get_shots_by_set(
-    date_: date, set_id: int, user: User = Depends(get_current_active_user)
+    request: Request,
+    date_: date,
+    set_id: int,
+    user: User = Depends(get_current_active_user),
+):
+    return await cached_json(
+        request,
+        user.athlete_id,
+        ("by-set", date_, set_id),
+        lambda: get_shots_by_set(user.athlete_id, date_, set_id),
+    )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "``shots`` events, each carrying a ShotDelta",
+            "content": {"text/event-stream": {}},
+        }
+    },
+)
+async def api_stream_shots(
+    date_: Optional[date] = None,
+    last_event_id: Optional[str] = Header(None),
+    user: User = Depends(get_current_active_user),
 ):
-    return get_shots_by_set(user.athlete_id, date_, set_id)
+    """
+    Server-sent events of the shots landing on ``date_`` (default today),
+    see app.events.stream. Needs a long-running server (uvicorn); behind
+    Lambda the response is buffered and never completes.
+    """
+    cursor = None
+    if last_event_id:
+        try:
+            cursor = time.fromisoformat(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    return StreamingResponse(
+        shot_stream(user.athlete_id, date_ or date.today(), cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
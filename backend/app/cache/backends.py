@@ -0,0 +1,104 @@
+"""
+Key/value stores for rendered responses.
+
+Entries are immutable: keys embed the athlete version, so a changed athlete
+gets new keys and stale entries simply age out of the LRU.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None: ...
+
+
+class NullCache(CacheBackend):
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """LRU of at most ``max_entries`` entries, local to the process."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskCache(CacheBackend):
+    """
+    LRU of at most ``max_entries`` files in ``directory``.
+
+    Meant for ``/tmp`` under Lambda, which outlives a single invocation in a
+    warm container. Recency is the file mtime, refreshed on every hit.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                etag, _, body = f.read().partition(b"\n")
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return CachedResponse(etag.decode(), body)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        # Written to a temp file and renamed so readers never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(entry.etag.encode() + b"\n" + entry.body)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.directory) if e.name.isalnum()]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
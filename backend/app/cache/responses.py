@@ -0,0 +1,92 @@
+import hashlib
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses import dumps_json
+from app.cache.backends import (
+    CacheBackend,
+    CachedResponse,
+    DiskCache,
+    MemoryCache,
+    NullCache,
+)
+from app.config import settings
+from app.crud.version_crud import get_athlete_version
+from app.metrics.timing import timed_serialization
+
+
+def make_cache() -> CacheBackend:
+    if settings.CACHE_BACKEND == "disk":
+        return DiskCache(settings.CACHE_DIR, settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES)
+    return NullCache()
+
+
+response_cache = make_cache()
+
+
+def tag(body: bytes) -> CachedResponse:
+    return CachedResponse(f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+
+
+def render(content: Any) -> bytes:
+    """Serialize like FastAPI's default JSONResponse."""
+    with timed_serialization():
+        if settings.FAST_SERIALIZATION:
+            # Built as plain dicts by the crud layer, nothing to convert
+            return dumps_json(content)
+        return JSONResponse(jsonable_encoder(content)).body
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def cached_body(
+    request: Request,
+    athlete_id: int,
+    key: tuple,
+    compute: Callable[[], Awaitable[bytes]],
+    media_type: str,
+) -> Response:
+    """
+    Return the bytes of ``compute()``, cached per athlete version.
+
+    ``key`` identifies the endpoint and its parameters. An import touching the
+    athlete bumps their version, so every earlier entry stops matching. When
+    the client already holds the current body, 304 is returned without one.
+    """
+    version = await get_athlete_version(athlete_id)
+    cache_key = ":".join(map(str, (*key, athlete_id, version)))
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        entry = tag(await compute())
+        response_cache.set(cache_key, entry)
+
+    # Private per user, and revalidated on every request
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type=media_type, headers=headers)
+
+
+async def cached_json(
+    request: Request,
+    athlete_id: int,
+    key: tuple,
+    compute: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Return ``compute()`` as JSON, cached like ``cached_body``."""
+
+    async def compute_body() -> bytes:
+        return render(await compute())
+
+    return await cached_body(
+        request, athlete_id, key, compute_body, media_type="application/json"
+    )
@@ -0,0 +1,74 @@
+"""
+Rebuild derived tables from shot_log.
+
+Usage (from the backend directory):
+
+    python -m app.commands.backfill relays [--date YYYY-MM-DD]
+    python -m app.commands.backfill daily-summary [--date YYYY-MM-DD]
+    python -m app.commands.backfill leaderboard
+
+Each table is built from the previous one: daily_summary rolls relays up from
+the stored relay numbers and the leaderboard is built from the summaries, so
+run them in this order.
+"""
+
+import argparse
+from datetime import date
+
+from app.crud.leaderboard_crud import refresh_leaderboard
+from app.crud.summary_crud import number_shots, refresh_daily_summaries
+from app.db.db import get_sync_session
+
+
+def backfill_relays(shot_date: date = None) -> None:
+    with get_sync_session() as session:
+        number_shots(session, shot_date)
+        session.commit()
+
+
+def backfill_daily_summary(shot_date: date = None) -> None:
+    with get_sync_session() as session:
+        refresh_daily_summaries(session, shot_date)
+        session.commit()
+
+
+def backfill_leaderboard() -> None:
+    with get_sync_session() as session:
+        refresh_leaderboard(session)
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild derived tables")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    relays = subparsers.add_parser(
+        "relays", help="Renumber relay_index and shot_number on shot_log"
+    )
+    relays.add_argument(
+        "--date", type=date.fromisoformat, help="Only renumber this shot date"
+    )
+
+    summary = subparsers.add_parser(
+        "daily-summary", help="Rebuild daily_summary and relay_summary"
+    )
+    summary.add_argument(
+        "--date", type=date.fromisoformat, help="Only rebuild this shot date"
+    )
+
+    subparsers.add_parser("leaderboard", help="Rebuild every leaderboard period")
+
+    args = parser.parse_args()
+    if args.command == "relays":
+        backfill_relays(args.date)
+        print("shot_log relays renumbered")
+    elif args.command == "daily-summary":
+        backfill_daily_summary(args.date)
+        print("daily_summary rebuilt")
+    elif args.command == "leaderboard":
+        backfill_leaderboard()
+        print("leaderboard rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Import the files of queued import jobs (POST /api/v1/import/jobs).
+
+Usage (from the backend directory):
+
+    python -m app.commands.import_worker [--workers N] [--once]
+
+Each of the ``--workers`` threads (default IMPORT_PARALLELISM) claims one
+file at a time from the queue in import_job_files and imports it like an
+upload, recording its progress as it goes. Any number of these processes can
+run against the same database. A file that fails on a database or other
+transient error is retried up to IMPORT_JOB_MAX_ATTEMPTS times; one that is
+not a readable SIUS log fails right away. ``--once`` imports what is queued
+and due, then exits, for running from a scheduler.
+"""
+
+import argparse
+import io
+import logging
+import threading
+
+from app.config import settings
+from app.crud.import_crud import ingest_csv
+from app.crud.job_crud import (
+    ClaimedFile,
+    claim_job_file,
+    complete_job_file,
+    fail_job_file,
+    report_job_progress,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def import_claimed_file(claimed: ClaimedFile) -> None:
+    name = f"{claimed.filename} (attempt {claimed.attempts})"
+    try:
+        result = ingest_csv(
+            io.BytesIO(claimed.content),
+            claimed.filename,
+            progress=lambda totals: report_job_progress(claimed, totals),
+        )
+    except ValueError as e:
+        # Not a SIUS log, another attempt would fail the same way
+        fail_job_file(claimed, e, retry=False)
+        logger.warning("%s: failed, %s", name, e)
+    except Exception as e:
+        retry = fail_job_file(claimed, e, retry=True)
+        logger.warning("%s: %s, %r", name, "will retry" if retry else "failed", e)
+    else:
+        complete_job_file(claimed, result)
+        logger.info(
+            "%s: %d shots (%d new, %d updated) in %.0f ms",
+            name,
+            result.rows,
+            result.inserted,
+            result.updated,
+            result.seconds * 1000,
+        )
+
+
+def work(stop: threading.Event, once: bool) -> None:
+    while not stop.is_set():
+        try:
+            claimed = claim_job_file()
+            if claimed is not None:
+                import_claimed_file(claimed)
+                continue
+        except Exception as e:
+            # The database is unreachable, a claimed file is taken over by
+            # another worker when its lease expires
+            logger.warning("%r", e)
+        if once:
+            return
+        stop.wait(settings.IMPORT_JOB_POLL_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import queued import job files")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.IMPORT_PARALLELISM,
+        help="Files imported concurrently",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Import what is queued, then exit"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(threadName)s %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=work, args=(stop, args.once), name=f"import-{i}")
+        for i in range(args.workers)
+    ]
+    logger.info("%d import workers started", args.workers)
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        # Files being imported are finished first
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
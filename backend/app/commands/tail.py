@@ -0,0 +1,133 @@
+"""
+Ingest SIUS log files while the range is still writing them.
+
+Usage (from the backend directory):
+
+    python -m app.commands.tail /path/to/sius/logs [--pattern "*.csv"] [--once]
+
+Every log in the folder is polled every TAIL_POLL_SECONDS. Newly appended
+lines are merged into shot_log through the same decoder and merge as an
+upload, and the byte offset reached is stored in tail_offsets in the same
+transaction, so a restart picks up after the last stored shot. Files are
+named YYYYMMDD like uploads, logs older than TAIL_MAX_AGE_DAYS are left to
+uploads and rotation is followed (see LogTail). Run a single daemon per
+folder. ``--once`` ingests what is there and exits.
+"""
+
+import argparse
+import glob
+import logging
+import os
+import time
+from datetime import date
+from typing import Dict
+
+from app.config import settings
+from app.crud.import_crud import parse_shot_date
+from app.crud.tail_crud import get_tail_offsets, ingest_tail_chunk
+from app.ingest.tail import LogTail
+
+
+logger = logging.getLogger(__name__)
+
+
+class FolderTail:
+    """The LogTail of every matching file in a folder."""
+
+    def __init__(self, directory: str, pattern: str):
+        self.pattern = os.path.join(os.path.abspath(directory), pattern)
+        self.tails: Dict[str, LogTail] = {}
+        self.dates: Dict[str, date] = {}
+        self.ignored = set()
+        self.saved = get_tail_offsets()
+
+    def discover(self) -> None:
+        for path in glob.glob(self.pattern):
+            if path in self.tails or path in self.ignored:
+                continue
+            try:
+                shot_date = parse_shot_date(os.path.basename(path))
+            except ValueError:
+                logger.warning("%s: not named YYYYMMDD, ignored", path)
+                self.ignored.add(path)
+                continue
+            if (date.today() - shot_date).days > settings.TAIL_MAX_AGE_DAYS:
+                # Finished sessions are imported by upload
+                self.ignored.add(path)
+                continue
+            self.dates[path] = shot_date
+            saved = self.saved.get(path)
+            if saved is None:
+                self.tails[path] = LogTail(path)
+            else:
+                self.tails[path] = LogTail(path, saved.inode, saved.byte_offset)
+
+    def step(self) -> bool:
+        """Ingest one micro-batch per file, return whether anything was read."""
+        self.discover()
+        busy = False
+        for path, tail in list(self.tails.items()):
+            try:
+                chunk = tail.poll(settings.TAIL_BATCH_BYTES)
+                if chunk is None:
+                    if not os.path.exists(path):
+                        # Drained and gone, rediscovered if it comes back
+                        tail.close()
+                        del self.tails[path]
+                        self.saved.pop(path, None)
+                    continue
+                started = time.perf_counter()
+                result = ingest_tail_chunk(path, self.dates[path], chunk)
+                tail.commit(chunk)
+            except Exception as e:
+                # Nothing was committed, the same lines are read again
+                logger.warning("%s: %r", path, e)
+                continue
+            busy = True
+            if result.rows or result.dropped:
+                logger.info(
+                    "%s: %d shots (%d new, %d updated, %d unreadable) in %.0f ms",
+                    os.path.basename(path),
+                    result.rows,
+                    result.inserted,
+                    result.updated,
+                    result.dropped,
+                    (time.perf_counter() - started) * 1000,
+                )
+        return busy
+
+    def close(self) -> None:
+        for tail in self.tails.values():
+            tail.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail SIUS log files into shot_log")
+    parser.add_argument("directory", help="Folder the range writes its logs to")
+    parser.add_argument("--pattern", default="*.csv", help="Log file name pattern")
+    parser.add_argument(
+        "--once", action="store_true", help="Ingest what is there, then exit"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S"
+    )
+
+    folder = FolderTail(args.directory, args.pattern)
+    logger.info("tailing %s", folder.pattern)
+    try:
+        while True:
+            if folder.step():
+                # Catching up, read the next batch right away
+                continue
+            if args.once:
+                break
+            time.sleep(settings.TAIL_POLL_SECONDS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        folder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -14,6 +15,17 @@ class Settings(BaseSettings):
     WORKERS_COUNT: int = 1
     # Enable uvicorn reloading
     RELOAD: bool = False
+    # Import routers, crud modules and models on the first request that needs
+    # them instead of at startup, shortening Lambda cold starts
+    LAZY_STARTUP: bool = False
+    # Load the bcrypt backend at startup rather than on the first login
+    PREWARM_PASSWORD_HASH: bool = True
+    # Time requests, SQL and serialization: Server-Timing header and /metrics
+    METRICS_ENABLED: bool = True
+    # Bearer token /metrics is scraped with, the route is only served when it
+    # is set. The samples name routes and SQL timings, so scrape it over a
+    # private network only
+    METRICS_TOKEN: Optional[str] = None
     # Database settings
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
@@ -21,6 +33,47 @@ class Settings(BaseSettings):
     DB_PASS: str = "postgres"
     _DB_BASE: str = "postgres"
     DB_ECHO: bool = False
+    # Import settings
+    # Use Postgres COPY for shot imports, falls back to executemany otherwise
+    IMPORT_USE_COPY: bool = True
+    # Bytes read from an upload at a time while streaming
+    IMPORT_CHUNK_SIZE: int = 64 * 1024
+    # Rows parsed and flushed to the database per batch
+    IMPORT_BATCH_SIZE: int = 5000
+    # Files ingested concurrently, each holding one pooled connection
+    IMPORT_PARALLELISM: int = 4
+    # What to do with shots that are already stored: "update" rewrites rows
+    # whose values changed, "nothing" keeps the stored row
+    IMPORT_ON_CONFLICT: Literal["nothing", "update"] = "update"
+    # Background import jobs (app.commands.import_worker)
+    # Attempts at a file before it is failed, retried after a backoff that
+    # starts at IMPORT_JOB_RETRY_SECONDS and doubles
+    IMPORT_JOB_MAX_ATTEMPTS: int = 3
+    IMPORT_JOB_RETRY_SECONDS: float = 10
+    # A claimed file whose worker reports no progress for this long is taken
+    # over by another worker
+    IMPORT_JOB_LEASE_SECONDS: int = 300
+    # Seconds an idle worker waits before looking at the queue again
+    IMPORT_JOB_POLL_SECONDS: float = 1.0
+    # Live tail of SIUS logs (app.commands.tail)
+    # Seconds between polls of an idle folder, bounds shot to database latency
+    TAIL_POLL_SECONDS: float = 0.2
+    # Bytes read from a log per micro-batch and transaction
+    TAIL_BATCH_BYTES: int = 256 * 1024
+    # Logs shot more than this many days ago are not tailed
+    TAIL_MAX_AGE_DAYS: int = 1
+    # Response cache settings
+    # "memory" keeps an LRU per process, "disk" stores entries under CACHE_DIR
+    # so warm Lambda containers reuse them through /tmp, "none" disables it
+    CACHE_BACKEND: Literal["memory", "disk", "none"] = "memory"
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_DIR: str = "/tmp/sius-cache"
+    # Build shot responses as plain dicts instead of validated pydantic models
+    # and encode them directly (with orjson when installed). Same JSON output
+    FAST_SERIALIZATION: bool = False
+    # Athletes whose trend series each process keeps, least recently used
+    # first out
+    TREND_CACHE_MAX_ATHLETES: int = 256
 
     @property
     def DB_BASE(self):
@@ -52,6 +105,12 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     BCRYPT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Threads hashing and verifying passwords, logins beyond it queue
+    PASSWORD_HASH_WORKERS: int = 2
+    # Users resolved from tokens are cached this long, at most until the token
+    # expires. Bounds how stale a change made by another process can be
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_ENTRIES: int = 1024
 
     model_config = {
         "env_file": os.path.expanduser("~/.envs/rrgc.env"),
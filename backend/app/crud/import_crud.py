@@ -1,54 +1,184 @@
-import csv
-from datetime import datetime
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import BinaryIO, Callable, Iterable, List, Optional, Union
 
+import numpy as np
 from fastapi import UploadFile
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session
 
+from app.config import settings
+from app.crud.leaderboard_crud import refresh_leaderboard
+from app.crud.summary_crud import (
+    lock_athlete_days,
+    number_shots,
+    refresh_daily_summaries,
+)
+from app.crud.version_crud import bump_athlete_versions
 from app.db.db import get_sync_session
-from app.db.models import ShotLog
+from app.db.models import ImportedFile, ShotLog
+from app.events.notify import notify_shots
+from app.ingest.bulk import MergeResult, merge_rows
+from app.ingest.decoder import SIUS_COLUMN_NAMES, ShotColumns, decode_lines
+from app.ingest.stream import hash_file, iter_line_batches
 
+# Column order of the tuples produced by ShotColumns.iter_rows
+SHOT_LOG_COLUMNS = (*SIUS_COLUMN_NAMES, "shot_date", "import_date")
 
-async def load_csv_file(file: UploadFile):
-    contents = await file.read()
-    filename = file.filename
-    date_str = filename[:8]
-    date_obj = datetime.strptime(date_str, "%Y%m%d").date()
 
-    decoded = contents.decode("utf-8").splitlines()
-    reader = csv.reader(decoded, delimiter=";")
+class IngestResult(BaseModel):
+    filename: str
+    rows: int
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    # True when the exact same file content was imported before
+    duplicate: bool = False
+    seconds: float
+    rows_per_sec: float
+    method: str
+
+
+def parse_shot_date(filename: str) -> date:
+    """SIUS log files are named after the day they were shot, YYYYMMDD..."""
+    return datetime.strptime(filename[:8], "%Y%m%d").date()
+
+
+def merge_shot_lines(
+    session: Session, columns: ShotColumns, import_date: date, totals: MergeResult
+) -> List[int]:
+    """
+    Merge a decoded batch into shot_log, add its counts to ``totals`` and
+    return the athletes it contains.
+    """
+    result = merge_rows(
+        session,
+        ShotLog.__table__,
+        SHOT_LOG_COLUMNS,
+        columns.iter_rows(import_date),
+        on_conflict=settings.IMPORT_ON_CONFLICT,
+        compare_exclude=("import_date",),
+        use_copy=settings.IMPORT_USE_COPY,
+    )
+    totals.rows += result.rows
+    totals.inserted += result.inserted
+    totals.updated += result.updated
+    totals.skipped += result.skipped
+    totals.method = result.method
+    return np.unique(columns["athlete_id"]).tolist()
+
+
+def refresh_derived_tables(
+    session: Session, shot_date: date, athlete_ids: Iterable[int]
+) -> None:
+    """
+    Renumber, summarize and rank the athlete days new shots landed on, and
+    tell live streams about them once the transaction commits.
+    """
+    athlete_ids = sorted(athlete_ids)
+    lock_athlete_days(session, shot_date, athlete_ids)
+    number_shots(session, shot_date, athlete_ids)
+    # Before the summaries, which are stamped with the new version
+    bump_athlete_versions(session, athlete_ids)
+    refresh_daily_summaries(session, shot_date, athlete_ids)
+    refresh_leaderboard(session, shot_date, athlete_ids)
+    notify_shots(session, shot_date, athlete_ids)
+
+
+def ingest_csv(
+    fileobj: BinaryIO,
+    filename: str,
+    progress: Optional[Callable[[MergeResult], None]] = None,
+) -> IngestResult:
+    """
+    Stream a SIUS csv file into shot_log.
+
+    A file whose content hash is already in imported_files for the same shot
+    date is skipped without being parsed. Otherwise it is read in ``IMPORT_CHUNK_SIZE`` byte chunks and
+    merged into shot_log every ``IMPORT_BATCH_SIZE`` rows, so memory use does
+    not grow with the file size. Shots already stored are updated or skipped
+    according to ``IMPORT_ON_CONFLICT``. All batches share one transaction;
+    ``progress`` is called with the running totals after each of them.
+    """
+    start = time.perf_counter()
+    date_obj = parse_shot_date(filename)
+    today = date.today()
+    digest = hash_file(fileobj, settings.IMPORT_CHUNK_SIZE)
+    totals = MergeResult()
 
     with get_sync_session() as session:
-        for row in reader:
-            shot_time_obj = datetime.strptime(row[6], "%H:%M:%S.%f").time()
-            shot_log = ShotLog(
-                athlete_id=int(row[0]),
-                primary_score=float(row[1]),
-                match_shot=int(row[2]),
-                firing_point=int(row[3]),
-                secondary_score=float(row[4]),
-                divisions=int(row[5]),
-                shot_time=shot_time_obj,
-                shot_date=date_obj,
-                inner_ten=bool(int(row[7])),
-                x_mm=float(row[8]),
-                y_mm=float(row[9]),
-                in_time=bool(int(row[10])),
-                time_since_change=float(row[11]),
-                sweep_direction=int(row[12]),
-                demonstration=bool(int(row[13])),
-                shoot_index=int(row[14]),
-                practice_index=int(row[15]),
-                insdel=int(row[16]),
-                total_kind=int(row[17]),
-                group_enum=int(row[18]),
-                fire_kind=int(row[19]),
-                log_event=int(row[20]),
-                log_type=int(row[21]),
-                time_of_year=float(row[22]),
-                relay_number=int(row[23]),
-                weapon_type=int(row[24]),
-                shooting_position=int(row[25]),
-                target_id=int(row[26]),
-                external_number=int(row[27]) if row[27] else None,
+        if session.get(ImportedFile, (digest, date_obj)) is not None:
+            seconds = time.perf_counter() - start
+            return IngestResult(
+                filename=filename,
+                rows=0,
+                duplicate=True,
+                seconds=seconds,
+                rows_per_sec=0.0,
+                method="fingerprint",
             )
-            session.add(shot_log)
+
+        athlete_ids = set()
+        for batch in iter_line_batches(
+            fileobj, settings.IMPORT_BATCH_SIZE, settings.IMPORT_CHUNK_SIZE
+        ):
+            columns = decode_lines(batch, date_obj)
+            athlete_ids.update(merge_shot_lines(session, columns, today, totals))
+            if progress is not None:
+                progress(totals)
+
+        if totals.inserted or totals.updated:
+            refresh_derived_tables(session, date_obj, athlete_ids)
+
+        # A concurrent upload of the same content may have registered it first
+        session.execute(
+            pg_insert(ImportedFile)
+            .values(
+                sha256=digest, shot_date=date_obj, filename=filename, rows=totals.rows
+            )
+            .on_conflict_do_nothing()
+        )
         session.commit()
+
+    seconds = time.perf_counter() - start
+    return IngestResult(
+        filename=filename,
+        rows=totals.rows,
+        inserted=totals.inserted,
+        updated=totals.updated,
+        skipped=totals.skipped,
+        seconds=seconds,
+        rows_per_sec=totals.rows / seconds if seconds else 0.0,
+        method=totals.method,
+    )
+
+
+# Parsing and inserting are blocking, so imports run on a dedicated pool that
+# bounds how many files are ingested (and connections held) at once
+_import_executor = ThreadPoolExecutor(
+    max_workers=settings.IMPORT_PARALLELISM, thread_name_prefix="import"
+)
+
+
+async def load_csv_file(file: UploadFile) -> IngestResult:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _import_executor, ingest_csv, file.file, file.filename
+    )
+
+
+async def load_csv_files(
+    files: List[UploadFile],
+) -> List[Union[IngestResult, Exception]]:
+    """
+    Ingest several files concurrently, each in its own session and transaction.
+
+    Results are returned in the order of ``files``; a file that fails yields its
+    exception instead of an IngestResult without affecting the others.
+    """
+    return await asyncio.gather(
+        *(load_csv_file(file) for file in files), return_exceptions=True
+    )
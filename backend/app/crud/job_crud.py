@@ -0,0 +1,307 @@
+"""
+Background import jobs, queued in the database.
+
+An upload is stored in import_job_files and answered at once with the job
+id. Workers (app.commands.import_worker) claim the files one at a time with
+FOR UPDATE SKIP LOCKED, so any number of them share the queue without
+blocking each other, and import them with ingest_csv.
+"""
+
+import uuid as uuid_pkg
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from fastapi import UploadFile
+from pydantic import BaseModel
+from sqlalchemy import and_, exists, or_, update
+from sqlmodel import Session, func, select
+
+from app.config import settings
+from app.crud.import_crud import IngestResult
+from app.db.db import get_async_session, get_sync_session
+from app.db.models import (
+    FILE_DONE,
+    FILE_FAILED,
+    FILE_QUEUED,
+    FILE_RUNNING,
+    ImportJob,
+    ImportJobFile,
+)
+from app.ingest.bulk import MergeResult
+
+
+class ImportJobFileStatus(BaseModel):
+    filename: str
+    status: str  # queued, running, done or failed
+    attempts: int
+    rows: int
+    inserted: int
+    updated: int
+    skipped: int
+    duplicate: bool
+    seconds: Optional[float]
+    error: Optional[str]
+
+
+class ImportJobStatus(BaseModel):
+    id: uuid_pkg.UUID
+    # queued, running, or done once no file is left to import; a done job
+    # may still have failed files
+    status: str
+    created_at: datetime
+    finished_at: Optional[datetime]
+    total_files: int
+    files_done: int
+    files_failed: int
+    rows: int
+    inserted: int
+    files: List[ImportJobFileStatus]
+
+
+class ClaimedFile(NamedTuple):
+    id: int
+    job_id: uuid_pkg.UUID
+    filename: str
+    content: bytes
+    # This claim's attempt, a later claim of the same file takes it over
+    attempts: int
+
+
+def _finish_job(session: Session, job_id: uuid_pkg.UUID) -> None:
+    """Mark the job finished if none of its files is left to import."""
+    pending = exists().where(
+        and_(
+            ImportJobFile.job_id == job_id,
+            ImportJobFile.status.in_((FILE_QUEUED, FILE_RUNNING)),
+        )
+    )
+    session.execute(
+        update(ImportJob)
+        .where(and_(ImportJob.id == job_id, ImportJob.finished_at.is_(None), ~pending))
+        .values(finished_at=func.now())
+    )
+
+
+def _lock_job(session: Session, job_id: uuid_pkg.UUID) -> None:
+    # Workers finishing the last files of a job concurrently would each see
+    # the other's file still running, so they take turns
+    session.execute(
+        select(ImportJob.id).where(ImportJob.id == job_id).with_for_update()
+    )
+
+
+async def enqueue_import_job(files: List[UploadFile]) -> uuid_pkg.UUID:
+    """Store the uploaded files as a new job, non-CSV files already failed."""
+    job = ImportJob()
+    job_files = []
+    for file in files:
+        if file.filename.endswith(".csv"):
+            job_file = ImportJobFile(
+                job_id=job.id, filename=file.filename, content=await file.read()
+            )
+        else:
+            job_file = ImportJobFile(
+                job_id=job.id,
+                filename=file.filename,
+                status=FILE_FAILED,
+                error="Only CSV files are allowed",
+            )
+        job_files.append(job_file)
+    async with get_async_session() as session:
+        session.add(job)
+        await session.flush()
+        session.add_all(job_files)
+        if all(job_file.status == FILE_FAILED for job_file in job_files):
+            await session.flush()
+            await session.run_sync(_finish_job, job.id)
+        await session.commit()
+    return job.id
+
+
+async def get_import_job_status(job_id: uuid_pkg.UUID) -> Optional[ImportJobStatus]:
+    async with get_async_session() as session:
+        job = await session.get(ImportJob, job_id)
+        if job is None:
+            return None
+        # Everything but the content
+        columns = [
+            getattr(ImportJobFile, name) for name in ImportJobFileStatus.model_fields
+        ]
+        files = (
+            await session.exec(
+                select(*columns)
+                .where(ImportJobFile.job_id == job_id)
+                .order_by(ImportJobFile.id)
+            )
+        ).all()
+
+    if job.finished_at is not None:
+        status = "done"
+    elif any(f.attempts for f in files):
+        status = "running"
+    else:
+        status = "queued"
+    return ImportJobStatus(
+        id=job.id,
+        status=status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        total_files=len(files),
+        files_done=sum(f.status == FILE_DONE for f in files),
+        files_failed=sum(f.status == FILE_FAILED for f in files),
+        rows=sum(f.rows for f in files),
+        inserted=sum(f.inserted for f in files),
+        files=[ImportJobFileStatus(**f._mapping) for f in files],
+    )
+
+
+def claim_job_file() -> Optional[ClaimedFile]:
+    """
+    Claim the oldest file that is due, or whose worker stopped, for
+    IMPORT_JOB_LEASE_SECONDS. Returns None when the queue is empty.
+    """
+    lease = func.now() + timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+    expired = and_(
+        ImportJobFile.status == FILE_RUNNING,
+        ImportJobFile.lease_expires_at < func.now(),
+    )
+    with get_sync_session() as session:
+        # A worker stopped during the last attempt: give up on the file. Jobs
+        # are locked before their files, in the order the other updates use
+        abandoned = and_(
+            expired, ImportJobFile.attempts >= settings.IMPORT_JOB_MAX_ATTEMPTS
+        )
+        job_ids = session.scalars(
+            select(ImportJobFile.job_id).where(abandoned).distinct()
+        ).all()
+        if job_ids:
+            for job_id in sorted(job_ids):
+                _lock_job(session, job_id)
+            session.execute(
+                update(ImportJobFile)
+                .where(and_(abandoned, ImportJobFile.job_id.in_(job_ids)))
+                .values(
+                    status=FILE_FAILED,
+                    lease_expires_at=None,
+                    error="The worker importing the file stopped",
+                )
+            )
+            for job_id in job_ids:
+                _finish_job(session, job_id)
+
+        candidate = (
+            select(ImportJobFile.id)
+            .where(
+                or_(
+                    and_(
+                        ImportJobFile.status == FILE_QUEUED,
+                        ImportJobFile.run_after <= func.now(),
+                    ),
+                    expired,
+                )
+            )
+            .order_by(ImportJobFile.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        claimed = session.execute(
+            update(ImportJobFile)
+            .where(ImportJobFile.id == candidate)
+            .values(
+                status=FILE_RUNNING,
+                attempts=ImportJobFile.attempts + 1,
+                lease_expires_at=lease,
+            )
+            .returning(
+                ImportJobFile.id,
+                ImportJobFile.job_id,
+                ImportJobFile.filename,
+                ImportJobFile.content,
+                ImportJobFile.attempts,
+            )
+        ).first()
+        session.commit()
+    return ClaimedFile(*claimed) if claimed is not None else None
+
+
+def _owned(claimed: ClaimedFile):
+    """The file, as long as no other worker took it over."""
+    return and_(
+        ImportJobFile.id == claimed.id,
+        ImportJobFile.status == FILE_RUNNING,
+        ImportJobFile.attempts == claimed.attempts,
+    )
+
+
+def report_job_progress(claimed: ClaimedFile, totals: MergeResult) -> None:
+    """Record the rows merged so far and extend the lease."""
+    with get_sync_session() as session:
+        session.execute(
+            update(ImportJobFile)
+            .where(_owned(claimed))
+            .values(
+                rows=totals.rows,
+                inserted=totals.inserted,
+                updated=totals.updated,
+                skipped=totals.skipped,
+                lease_expires_at=func.now()
+                + timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS),
+            )
+        )
+        session.commit()
+
+
+def complete_job_file(claimed: ClaimedFile, result: IngestResult) -> None:
+    with get_sync_session() as session:
+        _lock_job(session, claimed.job_id)
+        session.execute(
+            update(ImportJobFile)
+            .where(_owned(claimed))
+            .values(
+                status=FILE_DONE,
+                content=None,
+                lease_expires_at=None,
+                rows=result.rows,
+                inserted=result.inserted,
+                updated=result.updated,
+                skipped=result.skipped,
+                duplicate=result.duplicate,
+                seconds=result.seconds,
+                error=None,
+            )
+        )
+        _finish_job(session, claimed.job_id)
+        session.commit()
+
+
+def fail_job_file(claimed: ClaimedFile, error: Exception, retry: bool) -> bool:
+    """
+    Record a failed attempt. The file is queued again after a backoff
+    doubling from IMPORT_JOB_RETRY_SECONDS if ``retry`` is set and attempts
+    remain, otherwise it is failed. Returns whether it will be retried.
+    """
+    retry = retry and claimed.attempts < settings.IMPORT_JOB_MAX_ATTEMPTS
+    values = {
+        "lease_expires_at": None,
+        # Progress of the rolled back attempt
+        "rows": 0,
+        "inserted": 0,
+        "updated": 0,
+        "skipped": 0,
+        "error": str(error) or type(error).__name__,
+    }
+    if retry:
+        delay = settings.IMPORT_JOB_RETRY_SECONDS * 2 ** (claimed.attempts - 1)
+        values.update(
+            status=FILE_QUEUED, run_after=func.now() + timedelta(seconds=delay)
+        )
+    else:
+        values.update(status=FILE_FAILED)
+    with get_sync_session() as session:
+        _lock_job(session, claimed.job_id)
+        session.execute(update(ImportJobFile).where(_owned(claimed)).values(values))
+        if not retry:
+            _finish_job(session, claimed.job_id)
+        session.commit()
+    return retry
@@ -0,0 +1,160 @@
+import calendar
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import literal, text, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, and_, func, select
+
+from app.db.db import get_async_session
+from app.db.models import (
+    RELAY_SIZE,
+    Athletes,
+    DailySummary,
+    LeaderboardEntry,
+    RelaySummary,
+)
+
+LEADERBOARD_METRICS = ("best_relay", "average_score")
+
+# Period kind -> to_char format of the period key, None for the all-time board
+PERIOD_FORMATS = {"all": None, "year": "YYYY", "month": "YYYY-MM"}
+
+
+def period_bounds(kind: str, shot_date: date) -> Tuple[date, date]:
+    """First and last day of the year or month holding ``shot_date``."""
+    if kind == "year":
+        return date(shot_date.year, 1, 1), date(shot_date.year, 12, 31)
+    last_day = calendar.monthrange(shot_date.year, shot_date.month)[1]
+    return shot_date.replace(day=1), shot_date.replace(day=last_day)
+
+
+def _period_filter(model, kind: str, shot_date: Optional[date], athlete_ids):
+    conditions = []
+    if athlete_ids is not None:
+        conditions.append(model.athlete_id.in_(athlete_ids))
+    if shot_date is not None and kind != "all":
+        start, end = period_bounds(kind, shot_date)
+        conditions.append(model.shot_date.between(start, end))
+    return and_(true(), *conditions)
+
+
+def _period_key(model, kind: str):
+    """Period key column and the GROUP BY that goes with it."""
+    if PERIOD_FORMATS[kind] is None:
+        return literal("all"), (model.athlete_id,)
+    key = func.to_char(model.shot_date, PERIOD_FORMATS[kind])
+    return key, (model.athlete_id, key)
+
+
+def refresh_leaderboard(
+    session: Session,
+    shot_date: Optional[date] = None,
+    athlete_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Recompute leaderboard entries from daily_summary and relay_summary.
+
+    An import only moves the all-time, year and month boards of its shot date,
+    so just those entries of the touched athletes are rebuilt; with no filter
+    every period is rebuilt (backfill). Expects the summaries to be current,
+    runs in the caller's transaction.
+    """
+    if athlete_ids is not None:
+        athlete_ids = list(athlete_ids)
+        if not athlete_ids:
+            return
+
+    for kind in PERIOD_FORMATS:
+        day_period, day_groups = _period_key(DailySummary, kind)
+        days = (
+            select(
+                DailySummary.athlete_id,
+                day_period.label("period"),
+                func.sum(DailySummary.total_score).label("total_score"),
+                func.sum(DailySummary.total_shots).label("total_shots"),
+            )
+            .where(_period_filter(DailySummary, kind, shot_date, athlete_ids))
+            .group_by(*day_groups)
+            .having(func.sum(DailySummary.total_shots) > 0)
+            .subquery()
+        )
+        relay_period, relay_groups = _period_key(RelaySummary, kind)
+        relays = (
+            select(
+                RelaySummary.athlete_id,
+                relay_period.label("period"),
+                func.max(RelaySummary.total_score).label("best_relay"),
+            )
+            .where(
+                and_(
+                    _period_filter(RelaySummary, kind, shot_date, athlete_ids),
+                    # Only complete relays compete
+                    RelaySummary.total_shots == RELAY_SIZE,
+                )
+            )
+            .group_by(*relay_groups)
+            .subquery()
+        )
+        rollup = select(
+            days.c.period,
+            days.c.athlete_id,
+            relays.c.best_relay,
+            days.c.total_score / days.c.total_shots,
+            days.c.total_shots,
+        ).outerjoin(
+            relays,
+            and_(
+                relays.c.athlete_id == days.c.athlete_id,
+                relays.c.period == days.c.period,
+            ),
+        )
+        insert = pg_insert(LeaderboardEntry).from_select(
+            ["period", "athlete_id", "best_relay", "average_score", "total_shots"],
+            rollup,
+        )
+        session.execute(
+            insert.on_conflict_do_update(
+                index_elements=["period", "athlete_id"],
+                set_={
+                    "best_relay": insert.excluded.best_relay,
+                    "average_score": insert.excluded.average_score,
+                    "total_shots": insert.excluded.total_shots,
+                    "updated_at": text("current_timestamp(0)"),
+                },
+            )
+        )
+
+
+async def get_leaderboard(
+    period: str, metric: str, limit: int
+) -> List[Tuple[LeaderboardEntry, Optional[Athletes]]]:
+    """Top ``limit`` entries of a period by ``metric``, best first."""
+    column = getattr(LeaderboardEntry, metric)
+    statement = (
+        select(LeaderboardEntry, Athletes)
+        .outerjoin(Athletes, Athletes.id == LeaderboardEntry.athlete_id)
+        .where(and_(LeaderboardEntry.period == period, column.is_not(None)))
+        .order_by(column.desc(), LeaderboardEntry.athlete_id)
+        .limit(limit)
+    )
+    async with get_async_session() as session:
+        return list((await session.exec(statement)).all())
+
+
+async def get_leaderboard_rank(
+    period: str, metric: str, athlete_id: int
+) -> Optional[Tuple[int, LeaderboardEntry]]:
+    """Competition rank (ties share a rank) and entry of one athlete."""
+    column = getattr(LeaderboardEntry, metric)
+    async with get_async_session() as session:
+        entry = await session.get(LeaderboardEntry, (period, athlete_id))
+        value = getattr(entry, metric) if entry else None
+        if value is None:
+            return None
+        ahead = await session.exec(
+            select(func.count()).where(
+                and_(LeaderboardEntry.period == period, column > value)
+            )
+        )
+        return ahead.one() + 1, entry
@@ -1,26 +1,59 @@
+import struct
 from datetime import date, time, timedelta
-from typing import List
+from typing import List, Optional, Sequence, Type, TypeVar, Union
 
-from app.db.db import get_sync_session
-from app.db.models.shots_model import ShotLog
+import numpy as np
 from pydantic import BaseModel
-from sqlmodel import and_, select
+from sqlalchemy import Integer, Row, case, cast
+from sqlmodel import and_, func, select
+
+from app.analytics.groups import GROUP_METRICS, group_metrics
+from app.config import settings
+from app.crud.summary_crud import get_daily_summaries
+from app.db.db import get_async_session
+from app.db.models.shots_model import ShotLog
+from app.db.models.summary_model import DailySummary, RelaySummary
+
+M = TypeVar("M", bound=BaseModel)
+# What build_model returns for model M
+Built = Union[M, dict]
 
 
 class Shot(BaseModel):
     shot_time: time
+    shot_number: Optional[int] = None
     primary_score: float
     secondary_score: float
     x_mm: float
     y_mm: float
 
 
+class LiveShot(Shot):
+    match_shot: int
+    relay_index: Optional[int] = None
+
+
+class GroupMetrics(BaseModel):
+    """Group size of a set of match shots, see app.analytics.groups."""
+
+    mpi_x: float
+    mpi_y: float
+    extreme_spread: float
+    width: float
+    height: float
+    mean_radius: float
+    radial_sd: float
+    r50: float
+    r90: float
+
+
 class RelayStats(BaseModel):
     total_shots: int
     total_score: float
     best_score: float
     average_score: float
     list_of_shots: List[Shot]
+    group: Optional[GroupMetrics] = None
 
 
 class DayStats(BaseModel):
@@ -30,108 +63,262 @@ class DayStats(BaseModel):
     best_score: float
     list_of_relays: List[RelayStats]
     list_of_sighters: List[Shot]
+    group: Optional[GroupMetrics] = None  # Of all the day's match shots
+
+
+class ShotDelta(BaseModel):
+    """Shots of a day stored after a given time, and the day's totals."""
+
+    shots: List[LiveShot]
+    day: Optional[DayStats] = None  # From the rollups, None until a shot lands
+
+
+# The only shot_log columns the shot endpoints read. Selecting them instead of
+# whole ShotLog rows skips hydrating ~30 attributes per shot, and as they are
+# all in ix_shot_log_day the reads are index-only scans.
+SHOT_COLUMNS = (
+    ShotLog.shot_date,
+    ShotLog.match_shot,
+    ShotLog.relay_index,
+    ShotLog.shot_time,
+    ShotLog.shot_number,
+    ShotLog.primary_score,
+    ShotLog.secondary_score,
+    ShotLog.x_mm,
+    ShotLog.y_mm,
+)
+
+
+def select_shots(athlete_id: int, start_date: date, end_date: date):
+    """Shots of an athlete between two dates, served by ix_shot_log_day."""
+    return select(*SHOT_COLUMNS).where(
+        and_(
+            ShotLog.athlete_id == athlete_id,
+            ShotLog.shot_date >= start_date,
+            ShotLog.shot_date <= end_date,
+        )
+    )
+
+
+def select_set(athlete_id: int, shot_date: date, set_id: int):
+    """Match shots of one relay, served by ix_shot_log_relay."""
+    return select(*SHOT_COLUMNS).where(
+        and_(
+            ShotLog.athlete_id == athlete_id,
+            ShotLog.shot_date == shot_date,
+            ShotLog.relay_index == set_id,
+        )
+    )
+
+
+def build_model(model: Type[M], **fields) -> Built[M]:
+    """
+    Build a response model, or with FAST_SERIALIZATION the dict it would
+    serialize to. Rows from the database already carry the field types, so the
+    fast path skips validation; fields must be passed in declaration order to
+    keep the JSON identical.
+    """
+    if settings.FAST_SERIALIZATION:
+        return fields
+    return model(**fields)
+
+
+def create_shot(s: Row) -> Built[Shot]:
+    return build_model(
+        Shot,
+        shot_time=s.shot_time,
+        shot_number=s.shot_number,
+        primary_score=s.primary_score,
+        secondary_score=s.secondary_score,
+        x_mm=s.x_mm,
+        y_mm=s.y_mm,
+    )
+
+
+class GroupBatch:
+    """
+    Collects the shot groups of a response while it is built, then fills in
+    their ``group`` metrics with a single vectorized group_metrics call.
+    """
+
+    def __init__(self):
+        self.x = []
+        self.y = []
+        self.group_ids = []
+        self.targets = []
 
+    def add(self, target, shots: Sequence[Row]) -> None:
+        if not shots:
+            return
+        group_id = len(self.targets)
+        self.targets.append(target)
+        self.x.extend(s.x_mm for s in shots)
+        self.y.extend(s.y_mm for s in shots)
+        self.group_ids.extend([group_id] * len(shots))
 
-def create_relays_from_shots(match_shots: List[ShotLog]) -> List[RelayStats]:
-    """Split match shots into relays of 60 shots each, ordered by time."""
+    def resolve(self) -> None:
+        if not self.targets:
+            return
+        metrics = group_metrics(self.x, self.y, self.group_ids, len(self.targets))
+        columns = [metrics[name].tolist() for name in GROUP_METRICS]
+        for target, values in zip(self.targets, zip(*columns)):
+            group = build_model(GroupMetrics, **dict(zip(GROUP_METRICS, values)))
+            if isinstance(target, dict):
+                target["group"] = group
+            else:
+                target.group = group
+        self.targets = []
+
+
+def create_relays_from_shots(
+    match_shots: Sequence[Row], groups: Optional[GroupBatch] = None
+) -> List[Built[RelayStats]]:
+    """
+    Group match shots into relays by their stored relay_index.
+
+    Relay group metrics are queued on ``groups`` for the caller to resolve,
+    or computed right away without one.
+    """
+    if groups is None:
+        groups = GroupBatch()
+        relays = create_relays_from_shots(match_shots, groups)
+        groups.resolve()
+        return relays
     if not match_shots:
         return []
 
-    # Sort match shots by time
-    sorted_shots = sorted(match_shots, key=lambda s: s.shot_time)
+    # Sort match shots by time and bucket them by relay
+    relays_dict = {}
+    for shot in sorted(match_shots, key=lambda s: s.shot_time):
+        relays_dict.setdefault(shot.relay_index, []).append(shot)
 
     relays = []
-    for i in range(0, len(sorted_shots), 60):
-        relay_shots = sorted_shots[i : i + 60]
+    for relay_index in sorted(relays_dict):
+        relay_shots = relays_dict[relay_index]
 
         # Convert to Shot models
-        relay_models = [
-            Shot(
-                shot_time=s.shot_time,
-                primary_score=s.primary_score,
-                secondary_score=s.secondary_score,
-                x_mm=s.x_mm,
-                y_mm=s.y_mm,
-            )
-            for s in relay_shots
-        ]
+        relay_models = [create_shot(s) for s in relay_shots]
 
         # Calculate relay statistics
         total_score = sum(s.primary_score for s in relay_shots)
-        best_score = max([s.primary_score for s in relay_shots], default=0)
+        best_score = max([s.primary_score for s in relay_shots], default=0.0)
         total_shots = len(relay_shots)
-        avg_score = (total_score / total_shots) if total_shots else 0
+        avg_score = (total_score / total_shots) if total_shots else 0.0
 
-        relay_stats = RelayStats(
+        relay_stats = build_model(
+            RelayStats,
             total_shots=total_shots,
             total_score=total_score,
             best_score=best_score,
             average_score=avg_score,
             list_of_shots=relay_models,
+            group=None,
         )
+        groups.add(relay_stats, relay_shots)
         relays.append(relay_stats)
 
     return relays
 
 
-def get_recent_scores(athlete_id: int, days: int = 10) -> List[DayStats]:
+def create_day_stats(
+    day: date, day_shots: Sequence[Row], groups: Optional[GroupBatch] = None
+) -> Built[DayStats]:
+    """Day and relay stats of one day's shots, group metrics as above."""
+    if groups is None:
+        groups = GroupBatch()
+        day_stats = create_day_stats(day, day_shots, groups)
+        groups.resolve()
+        return day_stats
+    # Sighters
+    sighters = [s for s in day_shots if s.match_shot == 0]
+    sighter_models = [create_shot(s) for s in sighters]
+    # Match shots (match_shot == 1) - split into relays
+    match_shots = [s for s in day_shots if s.match_shot == 1]
+    relays = create_relays_from_shots(match_shots, groups)
+
+    # Calculate overall day statistics
+    best_score = max([s.primary_score for s in match_shots], default=0.0)
+
+    day_stats = build_model(
+        DayStats,
+        day=day,
+        total_shots=len(match_shots),
+        total_sighters=len(sighters),
+        best_score=best_score,
+        list_of_relays=relays,
+        list_of_sighters=sighter_models,
+        group=None,
+    )
+    groups.add(day_stats, match_shots)
+    return day_stats
+
+
+async def get_recent_scores(athlete_id: int, days: int = 10) -> List[Built[DayStats]]:
     today = date.today()
     start_date = today - timedelta(days=days - 1)
-    with get_sync_session() as session:
-        statement = select(ShotLog).where(
-            and_(
-                ShotLog.athlete_id == athlete_id,
-                ShotLog.shot_date >= start_date,
-                ShotLog.shot_date <= today,
-            )
-        )
-        shots = session.exec(statement).all()
+    async with get_async_session() as session:
+        shots = (await session.exec(select_shots(athlete_id, start_date, today))).all()
     # Group by day
     days_dict = {}
     for shot in shots:
-        d = shot.shot_date
-        if d not in days_dict:
-            days_dict[d] = []
-        days_dict[d].append(shot)
-    result = []
-    for d in sorted(days_dict.keys(), reverse=True):
-        day_shots = days_dict[d]
-        # Sighters
-        sighters = [s for s in day_shots if s.match_shot == 0]
-        sighter_models = [
-            Shot(
-                shot_time=s.shot_time,
-                primary_score=s.primary_score,
-                secondary_score=s.secondary_score,
-                x_mm=s.x_mm,
-                y_mm=s.y_mm,
-            )
-            for s in sighters
-        ]
-        # Match shots (match_shot == 1) - split into relays
-        match_shots = [s for s in day_shots if s.match_shot == 1]
-        relays = create_relays_from_shots(match_shots)
-
-        # Calculate overall day statistics
-        all_match_shots = [s for s in match_shots]
-        total_score = sum(s.primary_score for s in all_match_shots)
-        best_score = max([s.primary_score for s in all_match_shots], default=0)
-        total_shots = len(all_match_shots)
-
-        result.append(
-            DayStats(
-                day=d,
-                total_shots=total_shots,
-                total_sighters=len(sighters),
-                best_score=best_score,
-                list_of_relays=relays,
-                list_of_sighters=sighter_models,
+        days_dict.setdefault(shot.shot_date, []).append(shot)
+    # Group metrics of every relay and day are computed in one batch
+    groups = GroupBatch()
+    result = [
+        create_day_stats(d, days_dict[d], groups)
+        for d in sorted(days_dict.keys(), reverse=True)
+    ]
+    groups.resolve()
+    return result
+
+
+async def get_recent_summaries(
+    athlete_id: int, days: int = 10
+) -> List[Built[DayStats]]:
+    """
+    Same days and relay totals as get_recent_scores, read from the import-time
+    rollups. list_of_shots and list_of_sighters are left empty and there are
+    no group metrics.
+    """
+    today = date.today()
+    start_date = today - timedelta(days=days - 1)
+    day_rows, relay_rows = await get_daily_summaries(athlete_id, start_date, today)
+    return create_summary_days(day_rows, relay_rows)
+
+
+def create_summary_days(
+    day_rows: Sequence[DailySummary], relay_rows: Sequence[RelaySummary]
+) -> List[Built[DayStats]]:
+    """DayStats of daily and relay rollups, without shots or group metrics."""
+    relays_by_day = {}
+    for relay in relay_rows:
+        relays_by_day.setdefault(relay.shot_date, []).append(
+            build_model(
+                RelayStats,
+                total_shots=relay.total_shots,
+                total_score=relay.total_score,
+                best_score=relay.best_score,
+                average_score=relay.total_score / relay.total_shots,
+                list_of_shots=[],
+                group=None,
             )
         )
-    return result
+    return [
+        build_model(
+            DayStats,
+            day=day.shot_date,
+            total_shots=day.total_shots,
+            total_sighters=day.total_sighters,
+            best_score=day.best_score,
+            list_of_relays=relays_by_day.get(day.shot_date, []),
+            list_of_sighters=[],
+            group=None,
+        )
+        for day in day_rows
+    ]
 
 
-def get_stats(athlete_id: int, period: str = "10days") -> dict:
+async def get_stats(athlete_id: int, period: str = "10days") -> dict:
     # Parse period (e.g., "10days")
     days = 10
     if period.endswith("days"):
@@ -139,25 +326,38 @@ def get_stats(athlete_id: int, period: str = "10days") -> dict:
             days = int(period[:-4])
         except Exception:
             pass
-    recent = get_recent_scores(athlete_id, days)
-    all_scores = [
-        shot.primary_score
-        for day in recent
-        for relay in day.list_of_relays
-        for shot in relay.list_of_shots
-    ]
-    best_score = max(all_scores, default=0)
-    avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-    # For delta, compare to previous period
-    previous = get_recent_scores(athlete_id, days * 2)[days:]
-    prev_scores = [
-        shot.primary_score
-        for day in previous
-        for relay in day.list_of_relays
-        for shot in relay.list_of_shots
-    ]
-    prev_best = max(prev_scores, default=0)
-    prev_avg = sum(prev_scores) / len(prev_scores) if prev_scores else 0
+    today = date.today()
+    start_date = today - timedelta(days=days - 1)
+    # For delta, compare to the previous period of the same length
+    prev_start_date = start_date - timedelta(days=days)
+
+    # Both periods are aggregated in one pass over the 2N daily rollups and
+    # only the four scalars come back from the database
+    in_period = DailySummary.shot_date >= start_date
+
+    def average(condition):
+        return func.coalesce(
+            func.sum(DailySummary.total_score).filter(condition)
+            / func.nullif(func.sum(DailySummary.total_shots).filter(condition), 0),
+            0,
+        )
+
+    statement = select(
+        func.coalesce(func.max(DailySummary.best_score).filter(in_period), 0),
+        average(in_period),
+        func.coalesce(func.max(DailySummary.best_score).filter(~in_period), 0),
+        average(~in_period),
+    ).where(
+        and_(
+            DailySummary.athlete_id == athlete_id,
+            DailySummary.shot_date >= prev_start_date,
+            DailySummary.shot_date <= today,
+        )
+    )
+    async with get_async_session() as session:
+        best_score, avg_score, prev_best, prev_avg = (
+            await session.exec(statement)
+        ).one()
     return {
         "best_score": best_score,
         "average_score": avg_score,
@@ -166,49 +366,126 @@ def get_stats(athlete_id: int, period: str = "10days") -> dict:
     }
 
 
-def get_shots_by_day(athlete_id: int, shot_date: date) -> DayStats:
-    with get_sync_session() as session:
-        statement = select(ShotLog).where(
+async def get_shots_by_day(athlete_id: int, shot_date: date) -> Built[DayStats]:
+    async with get_async_session() as session:
+        statement = select_shots(athlete_id, shot_date, shot_date)
+        shots = (await session.exec(statement)).all()
+    return create_day_stats(shot_date, shots)
+
+
+async def get_last_shot_time(athlete_id: int, shot_date: date) -> Optional[time]:
+    async with get_async_session() as session:
+        statement = select(func.max(ShotLog.shot_time)).where(
             and_(ShotLog.athlete_id == athlete_id, ShotLog.shot_date == shot_date)
         )
-        shots = session.exec(statement).all()
-    sighters = [s for s in shots if s.match_shot == 0]
-    sighter_models = [
-        Shot(
-            shot_time=s.shot_time,
-            primary_score=s.primary_score,
-            secondary_score=s.secondary_score,
-            x_mm=s.x_mm,
-            y_mm=s.y_mm,
-        )
-        for s in sighters
-    ]
-    # Match shots (match_shot == 1) - split into relays
-    match_shots = [s for s in shots if s.match_shot == 1]
-    relays = create_relays_from_shots(match_shots)
+        return (await session.exec(statement)).one()
 
-    # Calculate overall day statistics
-    all_match_shots = [s for s in match_shots]
-    total_score = sum(s.primary_score for s in all_match_shots)
-    best_score = max([s.primary_score for s in all_match_shots], default=0)
-    total_shots = len(all_match_shots)
-
-    return DayStats(
-        day=shot_date,
-        total_shots=total_shots,
-        total_sighters=len(sighters),
-        best_score=best_score,
-        list_of_relays=relays,
-        list_of_sighters=sighter_models,
+
+async def get_shots_after(
+    athlete_id: int, shot_date: date, after: Optional[time]
+) -> Built[ShotDelta]:
+    """
+    Shots of a day stored after ``after`` (all of them for None), in time
+    order, with the day and relay totals from the rollups.
+    """
+    statement = select_shots(athlete_id, shot_date, shot_date)
+    if after is not None:
+        statement = statement.where(ShotLog.shot_time > after)
+    async with get_async_session() as session:
+        shots = (await session.exec(statement.order_by(ShotLog.shot_time))).all()
+    day_rows, relay_rows = await get_daily_summaries(athlete_id, shot_date, shot_date)
+    days = create_summary_days(day_rows, relay_rows)
+    return build_model(
+        ShotDelta,
+        shots=[
+            build_model(
+                LiveShot,
+                shot_time=s.shot_time,
+                shot_number=s.shot_number,
+                primary_score=s.primary_score,
+                secondary_score=s.secondary_score,
+                x_mm=s.x_mm,
+                y_mm=s.y_mm,
+                match_shot=s.match_shot,
+                relay_index=s.relay_index,
+            )
+            for s in shots
+        ],
+        day=days[0] if days else None,
     )
 
 
-def get_shots_by_set(athlete_id: int, shot_date: date, set_id: int) -> List[RelayStats]:
-    # Get all relays for the day
-    day_stats = get_shots_by_day(athlete_id, shot_date)
+async def get_shots_by_set(
+    athlete_id: int, shot_date: date, set_id: int
+) -> List[Built[RelayStats]]:
+    # Relays are numbered at import, so a set is a direct indexed lookup
+    async with get_async_session() as session:
+        statement = select_set(athlete_id, shot_date, set_id)
+        shots = (await session.exec(statement)).all()
+    return create_relays_from_shots(shots)
 
-    # Return the specific relay based on set_id (1-based indexing)
-    if 1 <= set_id <= len(day_stats.list_of_relays):
-        return [day_stats.list_of_relays[set_id - 1]]
-    else:
-        return []
+
+# Binary layout of the packed coordinates, all little-endian:
+#   header   4s magic b"SHOT", uint8 version, 3 pad bytes, uint32 count,
+#            int32 start date in days since 1970-01-01
+#   float32  x_mm[count]
+#   float32  y_mm[count]
+#   uint32   time[count]        0.01 s since midnight of the start date
+#   uint16   score[count]       decimal score x10
+#   uint8    match_shot[count]
+# Shots are in time order and every array starts 4-byte aligned, so a client
+# can view them in place as typed arrays.
+COORDINATES_HEADER = struct.Struct("<4sBxxxIi")
+COORDINATES_VERSION = 1
+_CENTISECONDS_PER_DAY = 24 * 60 * 60 * 100
+
+
+def pack_shot_coordinates(rows: Sequence[tuple], start_date: date) -> bytes:
+    """Pack (x_mm, y_mm, time, score, match_shot) rows into the layout above."""
+    x_mm, y_mm, offsets, scores, match_shots = (
+        np.array(rows, dtype=np.float64).reshape(len(rows), 5).T
+    )
+    header = COORDINATES_HEADER.pack(
+        b"SHOT",
+        COORDINATES_VERSION,
+        len(rows),
+        (start_date - date(1970, 1, 1)).days,
+    )
+    return b"".join(
+        (
+            header,
+            x_mm.astype("<f4").tobytes(),
+            y_mm.astype("<f4").tobytes(),
+            offsets.astype("<u4").tobytes(),
+            np.rint(scores * 10).astype("<u2").tobytes(),
+            match_shots.astype("u1").tobytes(),
+        )
+    )
+
+
+async def get_shot_coordinates(
+    athlete_id: int, start_date: date, end_date: date
+) -> bytes:
+    """Every shot of an athlete between two dates, packed for target plots."""
+    offset = (ShotLog.shot_date - start_date) * _CENTISECONDS_PER_DAY + cast(
+        func.round(func.extract("epoch", ShotLog.shot_time) * 100), Integer
+    )
+    # Pistol logs the decimal score as secondary_score, rifle as primary_score
+    score = case(
+        (ShotLog.secondary_score > 0, ShotLog.secondary_score),
+        else_=ShotLog.primary_score,
+    )
+    statement = (
+        select(ShotLog.x_mm, ShotLog.y_mm, offset, score, ShotLog.match_shot)
+        .where(
+            and_(
+                ShotLog.athlete_id == athlete_id,
+                ShotLog.shot_date >= start_date,
+                ShotLog.shot_date <= end_date,
+            )
+        )
+        .order_by(ShotLog.shot_date, ShotLog.shot_time)
+    )
+    async with get_async_session() as session:
+        rows = (await session.exec(statement)).all()
+    return pack_shot_coordinates(rows, start_date)
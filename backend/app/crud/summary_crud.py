@@ -0,0 +1,256 @@
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, null, or_, text, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, and_, func, select
+
+from app.db.db import get_async_session
+from app.db.models import (
+    RELAY_SIZE,
+    AthleteVersion,
+    DailySummary,
+    RelaySummary,
+    ShotLog,
+)
+
+
+def _day_filter(model, shot_date: Optional[date], athlete_ids: Optional[List[int]]):
+    conditions = []
+    if shot_date is not None:
+        conditions.append(model.shot_date == shot_date)
+    if athlete_ids is not None:
+        conditions.append(model.athlete_id.in_(athlete_ids))
+    return and_(true(), *conditions)
+
+
+def lock_athlete_days(
+    session: Session, shot_date: date, athlete_ids: Iterable[int]
+) -> None:
+    """
+    Take a transaction advisory lock on each athlete day, in id order.
+
+    Numbering and the rollups are rebuilt from the whole day, so two imports
+    into the same athlete day must take turns: the second one waits for the
+    first to commit, and its next statement then sees the first one's shots.
+    Without it each would number only its own, uncommitted shots.
+    """
+    athlete_ids = sorted(set(athlete_ids))
+    if not athlete_ids:
+        return
+    # unnest yields the ids in array order, so locks are taken in that order
+    ids = func.unnest(athlete_ids).table_valued("athlete_id").render_derived()
+    session.execute(
+        select(
+            func.pg_advisory_xact_lock(ids.c.athlete_id, shot_date.toordinal())
+        ).select_from(ids)
+    )
+
+
+def number_shots(
+    session: Session,
+    shot_date: Optional[date] = None,
+    athlete_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Assign relay_index and shot_number to the shots of the matching days.
+
+    Match shots are numbered by time into relays of RELAY_SIZE shots, sighters
+    are numbered in their own sequence and get no relay. Like the summaries,
+    whole days are renumbered because a late shot shifts everything after it;
+    only rows whose numbers change are written.
+    """
+    if athlete_ids is not None:
+        athlete_ids = list(athlete_ids)
+        if not athlete_ids:
+            return
+
+    position = (
+        func.row_number()
+        .over(
+            partition_by=(ShotLog.athlete_id, ShotLog.shot_date, ShotLog.match_shot),
+            order_by=ShotLog.shot_time,
+        )
+        .label("position")
+    )
+    numbered = (
+        select(
+            ShotLog.athlete_id,
+            ShotLog.shot_date,
+            ShotLog.shot_time,
+            ShotLog.match_shot,
+            position,
+        )
+        .where(
+            and_(
+                _day_filter(ShotLog, shot_date, athlete_ids),
+                ShotLog.match_shot.in_((0, 1)),
+            )
+        )
+        .subquery()
+    )
+    is_match = numbered.c.match_shot == 1
+    relay_index = case(
+        (is_match, (numbered.c.position - 1) // RELAY_SIZE + 1), else_=null()
+    )
+    shot_number = case(
+        (is_match, (numbered.c.position - 1) % RELAY_SIZE + 1),
+        else_=numbered.c.position,
+    )
+    session.execute(
+        update(ShotLog)
+        .where(
+            and_(
+                ShotLog.athlete_id == numbered.c.athlete_id,
+                ShotLog.shot_date == numbered.c.shot_date,
+                ShotLog.shot_time == numbered.c.shot_time,
+                or_(
+                    ShotLog.relay_index.is_distinct_from(relay_index),
+                    ShotLog.shot_number.is_distinct_from(shot_number),
+                ),
+            )
+        )
+        .values(relay_index=relay_index, shot_number=shot_number)
+    )
+
+
+def refresh_daily_summaries(
+    session: Session,
+    shot_date: Optional[date] = None,
+    athlete_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Recompute daily_summary and relay_summary from shot_log.
+
+    Only the days matching ``shot_date`` and ``athlete_ids`` are rebuilt, so an
+    import refreshes just the athlete days it touched; with no filter every
+    day is rebuilt (backfill). Runs in the caller's transaction. Days are
+    stamped with the athlete's current version, so an import bumps it first.
+
+    Relays are rolled up from the stored relay numbers, so an import must
+    hold lock_athlete_days from before number_shots until it commits, or a
+    concurrent import of the same day publishes totals of its own shots.
+    """
+    if athlete_ids is not None:
+        athlete_ids = list(athlete_ids)
+        if not athlete_ids:
+            return
+    shots_filter = _day_filter(ShotLog, shot_date, athlete_ids)
+
+    day_rollup = (
+        select(
+            ShotLog.athlete_id,
+            ShotLog.shot_date,
+            func.count().filter(ShotLog.match_shot == 1),
+            func.count().filter(ShotLog.match_shot == 0),
+            func.coalesce(
+                func.sum(ShotLog.primary_score).filter(ShotLog.match_shot == 1), 0
+            ),
+            func.coalesce(
+                func.sum(ShotLog.primary_score * ShotLog.primary_score).filter(
+                    ShotLog.match_shot == 1
+                ),
+                0,
+            ),
+            func.coalesce(
+                func.max(ShotLog.primary_score).filter(ShotLog.match_shot == 1), 0
+            ),
+            func.coalesce(
+                select(AthleteVersion.version)
+                .where(AthleteVersion.athlete_id == ShotLog.athlete_id)
+                .scalar_subquery(),
+                0,
+            ),
+        )
+        .where(shots_filter)
+        .group_by(ShotLog.athlete_id, ShotLog.shot_date)
+    )
+    insert_days = pg_insert(DailySummary).from_select(
+        [
+            "athlete_id",
+            "shot_date",
+            "total_shots",
+            "total_sighters",
+            "total_score",
+            "total_score_squares",
+            "best_score",
+            "version",
+        ],
+        day_rollup,
+    )
+    session.execute(
+        insert_days.on_conflict_do_update(
+            index_elements=["athlete_id", "shot_date"],
+            set_={
+                "total_shots": insert_days.excluded.total_shots,
+                "total_sighters": insert_days.excluded.total_sighters,
+                "total_score": insert_days.excluded.total_score,
+                "total_score_squares": insert_days.excluded.total_score_squares,
+                "best_score": insert_days.excluded.best_score,
+                "version": insert_days.excluded.version,
+                "updated_at": text("current_timestamp(0)"),
+            },
+        )
+    )
+
+    # Relays of every touched day are rebuilt, their boundaries move when a
+    # shot lands between existing ones. Expects number_shots to have run.
+    session.execute(
+        delete(RelaySummary).where(_day_filter(RelaySummary, shot_date, athlete_ids))
+    )
+
+    relay_rollup = (
+        select(
+            ShotLog.athlete_id,
+            ShotLog.shot_date,
+            ShotLog.relay_index,
+            func.count(),
+            func.sum(ShotLog.primary_score),
+            func.max(ShotLog.primary_score),
+        )
+        .where(and_(shots_filter, ShotLog.match_shot == 1))
+        .group_by(ShotLog.athlete_id, ShotLog.shot_date, ShotLog.relay_index)
+    )
+    session.execute(
+        pg_insert(RelaySummary).from_select(
+            [
+                "athlete_id",
+                "shot_date",
+                "relay_index",
+                "total_shots",
+                "total_score",
+                "best_score",
+            ],
+            relay_rollup,
+        )
+    )
+
+
+async def get_daily_summaries(
+    athlete_id: int, start_date: date, end_date: date
+) -> Tuple[List[DailySummary], List[RelaySummary]]:
+    """Day and relay rollups of an athlete between two dates, newest first."""
+    async with get_async_session() as session:
+        days = await session.exec(
+            select(DailySummary)
+            .where(
+                and_(
+                    DailySummary.athlete_id == athlete_id,
+                    DailySummary.shot_date >= start_date,
+                    DailySummary.shot_date <= end_date,
+                )
+            )
+            .order_by(DailySummary.shot_date.desc())
+        )
+        relays = await session.exec(
+            select(RelaySummary)
+            .where(
+                and_(
+                    RelaySummary.athlete_id == athlete_id,
+                    RelaySummary.shot_date >= start_date,
+                    RelaySummary.shot_date <= end_date,
+                )
+            )
+            .order_by(RelaySummary.shot_date.desc(), RelaySummary.relay_index)
+        )
+        return list(days.all()), list(relays.all())
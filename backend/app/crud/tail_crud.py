@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+
+from app.crud.import_crud import merge_shot_lines, refresh_derived_tables
+from app.db.db import get_sync_session
+from app.db.models import TailOffset
+from app.ingest.bulk import MergeResult
+from app.ingest.decoder import ShotColumns, decode_lines
+from app.ingest.tail import TailChunk
+
+
+class TailResult(MergeResult):
+    # Appended lines that did not parse and were skipped
+    dropped: int = 0
+
+
+def get_tail_offsets() -> Dict[str, TailOffset]:
+    with get_sync_session() as session:
+        return {offset.path: offset for offset in session.exec(select(TailOffset))}
+
+
+def decode_tail_lines(lines: List[str], shot_date: date) -> Tuple[ShotColumns, int]:
+    """
+    Decode appended lines, dropping the ones that do not parse.
+
+    A whole upload fails on a bad line, but the tail cannot stop at one
+    without stalling every shot after it. Returns the columns and how many
+    lines were dropped.
+    """
+    try:
+        return decode_lines(lines, shot_date), 0
+    except ValueError:
+        pass
+    valid = []
+    for line in lines:
+        try:
+            decode_lines([line], shot_date)
+        except ValueError:
+            continue
+        valid.append(line)
+    return decode_lines(valid, shot_date), len(lines) - len(valid)
+
+
+def ingest_tail_chunk(path: str, shot_date: date, chunk: TailChunk) -> TailResult:
+    """
+    Merge lines appended to a SIUS log and store the new offset with them, so
+    they are ingested exactly once even when the daemon restarts.
+    """
+    columns, dropped = decode_tail_lines(chunk.lines, shot_date)
+    totals = TailResult(dropped=dropped)
+    with get_sync_session() as session:
+        if len(columns):
+            athlete_ids = merge_shot_lines(session, columns, date.today(), totals)
+            if totals.inserted or totals.updated:
+                refresh_derived_tables(session, shot_date, athlete_ids)
+
+        insert_offset = pg_insert(TailOffset).values(
+            path=path, inode=chunk.inode, byte_offset=chunk.end_offset
+        )
+        session.execute(
+            insert_offset.on_conflict_do_update(
+                index_elements=["path"],
+                set_={
+                    "inode": insert_offset.excluded.inode,
+                    "byte_offset": insert_offset.excluded.byte_offset,
+                    "updated_at": text("current_timestamp(0)"),
+                },
+            )
+        )
+        session.commit()
+    return totals
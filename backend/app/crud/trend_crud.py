@@ -0,0 +1,123 @@
+import asyncio
+import math
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import List, Optional
+
+from pydantic import BaseModel
+from sqlmodel import and_, func, select
+
+from app.analytics.trends import TREND_WINDOWS, TrendSeries
+from app.config import settings
+from app.crud.shots_crud import Built, build_model
+from app.db.db import get_async_session
+from app.db.models import DailySummary
+
+
+class TrendPoint(BaseModel):
+    day: date
+    total_shots: int
+    average_score: float
+    # Per shot mean and sample standard deviation over the trailing 7, 30 and
+    # 90 calendar days, the mean is None without shots and the SD below two
+    mean_7: Optional[float] = None
+    sd_7: Optional[float] = None
+    mean_30: Optional[float] = None
+    sd_30: Optional[float] = None
+    mean_90: Optional[float] = None
+    sd_90: Optional[float] = None
+
+
+class _AthleteTrend:
+    def __init__(self):
+        self.series = TrendSeries()
+        # Highest daily_summary.version applied so far
+        self.watermark: Optional[int] = None
+        # One refresh of the series at a time
+        self.lock = asyncio.Lock()
+
+
+# LRU of the series, only used from the event loop. The locks live in the
+# entries, so they are bounded with them
+_trends: "OrderedDict[int, _AthleteTrend]" = OrderedDict()
+
+
+def _athlete_trend(athlete_id: int) -> _AthleteTrend:
+    trend = _trends.get(athlete_id)
+    if trend is not None:
+        _trends.move_to_end(athlete_id)
+        return trend
+    trend = _trends[athlete_id] = _AthleteTrend()
+    while len(_trends) > settings.TREND_CACHE_MAX_ATHLETES:
+        # A refresh still running on an evicted series just finishes on it
+        _trends.popitem(last=False)
+    return trend
+
+
+async def _refresh(athlete_id: int, trend: _AthleteTrend) -> None:
+    """
+    Apply the daily_summary rows changed since the last refresh.
+
+    Appending a day only reads that day. A changed past day is reapplied with
+    everything after it, since the prefix sums after it move.
+    """
+    columns = (
+        DailySummary.shot_date,
+        DailySummary.total_shots,
+        DailySummary.total_score,
+        DailySummary.total_score_squares,
+    )
+    of_athlete = DailySummary.athlete_id == athlete_id
+    async with get_async_session() as session:
+        # Versions commit in order (see DailySummary.version), so once a
+        # version is visible every row written before it is too
+        changed = select(
+            func.min(DailySummary.shot_date), func.max(DailySummary.version)
+        ).where(of_athlete)
+        if trend.watermark is not None:
+            changed = changed.where(DailySummary.version > trend.watermark)
+        since, version = (await session.exec(changed)).one()
+        if since is None:
+            return
+        # Rows committed in between are read too and applied again next time
+        rows = (
+            await session.exec(
+                select(*columns).where(
+                    and_(of_athlete, DailySummary.shot_date >= since)
+                )
+            )
+        ).all()
+    trend.series.replace_from(since, (tuple(row) for row in rows))
+    trend.watermark = version
+
+
+def _optional(value: float) -> Optional[float]:
+    # NaN and inf have no JSON encoding
+    return value if math.isfinite(value) else None
+
+
+async def get_trend(athlete_id: int, days: int = 365) -> List[Built[TrendPoint]]:
+    """
+    Daily averages and rolling means/SDs of the last ``days`` days.
+
+    The athlete's series is kept in process and extended from the rows whose
+    version moved, so history is read from the database once.
+    """
+    trend = _athlete_trend(athlete_id)
+    async with trend.lock:
+        await _refresh(athlete_id, trend)
+        stats = trend.series.rolling(date.today() - timedelta(days=days - 1))
+
+    values = {name: column.tolist() for name, column in stats.items()}
+    points = []
+    for i, day in enumerate(values["day"]):
+        fields = {
+            "day": date.fromordinal(day),
+            "total_shots": int(values["total_shots"][i]),
+            "average_score": values["average_score"][i],
+        }
+        for window in TREND_WINDOWS:
+            fields[f"mean_{window}"] = _optional(values[f"mean_{window}"][i])
+            fields[f"sd_{window}"] = _optional(values[f"sd_{window}"][i])
+        points.append(build_model(TrendPoint, **fields))
+    return points
@@ -1,19 +1,22 @@
 from typing import Optional
 
-from app.db.db import get_sync_session
+from app.db.db import get_async_session
 from app.db.models import User, UserCreate
-from app.security.hash import get_password_hash
-from sqlalchemy import or_
+from app.security.hash import get_password_hash_async
+from app.security.user_cache import user_cache
+from sqlalchemy import case, or_
 from sqlmodel import select
 
 
-def create_user(user: UserCreate, disabled: bool = False, admin: bool = False) -> User:
-    hashed_password = get_password_hash(user.password)
-    with get_sync_session() as session:
+async def create_user(
+    user: UserCreate, disabled: bool = False, admin: bool = False
+) -> User:
+    hashed_password = await get_password_hash_async(user.password)
+    async with get_async_session() as session:
         statement = select(User).where(
             or_(User.email == user.email, User.username == user.username)
         )
-        db_user = session.exec(statement).first()
+        db_user = (await session.exec(statement)).first()
         if db_user:
             raise ValueError("User already exists")
         user = User(
@@ -23,43 +26,36 @@ def create_user(user: UserCreate, disabled: bool = False, admin: bool = False) -
             is_admin=admin,
         )
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
+    user_cache.invalidate(user.username)
     return user.model_copy()
 
 
-def get_user(username: str) -> Optional[User]:
-    with get_sync_session() as session:
+async def get_user(username: str) -> Optional[User]:
+    async with get_async_session() as session:
         statement = select(User).where(User.username == username)
-        user = session.exec(statement).first()
+        user = (await session.exec(statement)).first()
         if not user:
             return None
         return user
 
 
-def get_user_by_any_identifier(identifier: str) -> Optional[User]:
+async def get_user_by_any_identifier(identifier: str) -> Optional[User]:
     """
     Get user by username, email, or member number (athlete_id).
-    For member number, we search by athlete_id.
+    A member number match wins over a username or email match.
     """
-    with get_sync_session() as session:
-        # Try to parse as integer for member number
-        try:
-            member_id = int(identifier)
-            # Search by athlete_id
-            statement = select(User).where(User.athlete_id == member_id)
-            user = session.exec(statement).first()
-            if user:
-                return user
-        except ValueError:
-            # Not a number, continue with string search
-            pass
-
-        # Search by username or email
-        statement = select(User).where(
-            or_(User.username == identifier, User.email == identifier)
-        )
-        user = session.exec(statement).first()
-        if not user:
-            return None
-        return user
+    conditions = [User.username == identifier, User.email == identifier]
+    statement = select(User)
+    # Try to parse as integer for member number
+    try:
+        member_id = int(identifier)
+    except ValueError:
+        member_id = None
+    if member_id is not None:
+        conditions.append(User.athlete_id == member_id)
+        statement = statement.order_by(case((User.athlete_id == member_id, 0), else_=1))
+    async with get_async_session() as session:
+        statement = statement.where(or_(*conditions)).limit(1)
+        return (await session.exec(statement)).first()
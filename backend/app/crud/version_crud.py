@@ -0,0 +1,35 @@
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session
+
+from app.db.db import get_async_session
+from app.db.models import AthleteVersion
+
+
+def bump_athlete_versions(session: Session, athlete_ids: Iterable[int]) -> None:
+    """Increment the version of each athlete, in the caller's transaction."""
+    # Sorted so concurrent imports lock the rows in the same order
+    athlete_ids = sorted(athlete_ids)
+    if not athlete_ids:
+        return
+    insert = pg_insert(AthleteVersion).values(
+        [{"athlete_id": athlete_id, "version": 1} for athlete_id in athlete_ids]
+    )
+    session.execute(
+        insert.on_conflict_do_update(
+            index_elements=["athlete_id"],
+            set_={
+                "version": AthleteVersion.version + 1,
+                "updated_at": text("current_timestamp(0)"),
+            },
+        )
+    )
+
+
+async def get_athlete_version(athlete_id: int) -> int:
+    """Current version of an athlete's shots, 0 before their first import."""
+    async with get_async_session() as session:
+        row = await session.get(AthleteVersion, athlete_id)
+        return row.version if row else 0
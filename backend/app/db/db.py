@@ -1,9 +1,65 @@
+from functools import cache
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
+from app.metrics.sql import instrument_engine
+
+# Engines are created on first use rather than at import, which keeps the
+# psycopg2/asyncpg imports and pool setup out of Lambda cold starts.
+# ``db.sync_engine``, ``db.async_engine`` and ``db.async_session_maker`` still
+# resolve through the module ``__getattr__`` below.
+
+
+@cache
+def get_sync_engine() -> Engine:
+    """Sync engine, used by Alembic and by imports running on the import pool."""
+    engine = create_engine(
+        settings.SYNC_DB_URL,
+        echo=settings.DB_ECHO,
+        # Concurrent imports each hold a connection for their whole transaction
+        pool_size=max(5, settings.IMPORT_PARALLELISM),
+    )
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """Async engine, used by the request handlers so DB calls don't block the loop."""
+    engine = create_async_engine(settings.DB_URL, echo=settings.DB_ECHO)
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine.sync_engine)
+    return engine
+
 
-sync_engine = create_engine(settings.SYNC_DB_URL, echo=True)
+@cache
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        get_async_engine(), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "sync_engine": get_sync_engine,
+    "async_engine": get_async_engine,
+    "async_session_maker": get_async_session_maker,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_sync_session():
-    return Session(sync_engine)
+    return Session(get_sync_engine())
+
+
+def get_async_session() -> AsyncSession:
+    return get_async_session_maker()()
@@ -1,3 +1,9 @@
 from .athlete_model import *
+from .import_model import *
+from .job_model import *
+from .leaderboard_model import *
 from .shots_model import *
+from .summary_model import *
+from .tail_model import *
 from .user_model import *
+from .version_model import *
@@ -0,0 +1,21 @@
+from datetime import date
+
+from sqlmodel import Field
+
+from app.db.models.common import TimestampModel
+
+
+class ImportedFile(TimestampModel, table=True):
+    __tablename__ = "imported_files"
+
+    sha256: str = Field(
+        primary_key=True, max_length=64, description="Hex digest of the file content"
+    )
+    # The day comes from the filename, so the same content imported as another
+    # day's file is a different import
+    shot_date: date = Field(primary_key=True)
+    filename: str
+    rows: int  # Rows parsed from the file when it was first imported
+
+    def __repr__(self):
+        return f"<ImportedFile (sha256: {self.sha256}, filename: {self.filename})>"
@@ -0,0 +1,69 @@
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, LargeBinary, text
+from sqlmodel import Field
+
+from app.db.models.common import TimestampModel, UUIDModel
+
+# Import job file states: waiting (or waiting for a retry), claimed by a
+# worker, imported, given up on
+FILE_QUEUED = "queued"
+FILE_RUNNING = "running"
+FILE_DONE = "done"
+FILE_FAILED = "failed"
+
+
+class ImportJob(UUIDModel, TimestampModel, table=True):
+    """A batch of uploaded files imported in the background."""
+
+    __tablename__ = "import_jobs"
+
+    finished_at: Optional[datetime] = Field(
+        default=None, description="When the last file was done or failed"
+    )
+
+
+class ImportJobFile(TimestampModel, table=True):
+    """
+    One uploaded file of an import job, and the queue entry workers claim.
+
+    A worker claims a file by setting it running with a lease; a file whose
+    lease expired belongs to a worker that stopped and is claimed again.
+    """
+
+    __tablename__ = "import_job_files"
+    __table_args__ = (
+        # Serves the claim query, which looks for queued and expired files
+        Index("ix_import_job_files_claim", "status", "run_after"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: uuid_pkg.UUID = Field(foreign_key="import_jobs.id", index=True)
+    filename: str
+    # The uploaded bytes, cleared once the file is imported
+    content: Optional[bytes] = Field(default=None, sa_type=LargeBinary)
+    status: str = Field(default=FILE_QUEUED, max_length=16)
+    attempts: int = 0
+    # Times are all set by the database clock, the workers compare them to it.
+    # Not rounded to the second, which could put a new file in the future
+    run_after: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("current_timestamp")},
+        description="Not claimed before, delays retries",
+    )
+    lease_expires_at: Optional[datetime] = None
+
+    # Progress while running, the import result once done
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    duplicate: bool = False
+    seconds: Optional[float] = None
+    error: Optional[str] = None  # Of the last failed attempt
+
+    def __repr__(self):
+        return f"<ImportJobFile (filename: {self.filename}, status: {self.status})>"
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from sqlalchemy import Index, column
+from sqlmodel import Field
+
+from app.db.models.common import TimestampModel
+
+
+class LeaderboardEntry(TimestampModel, table=True):
+    """
+    Per athlete and period standing, maintained at import from the summaries.
+
+    ``period`` is "all", a year ("2025") or a month ("2025-05"). The indexes
+    serve top-k as a backward range scan and ranks as an index-only count.
+    """
+
+    __tablename__ = "leaderboard"
+    __table_args__ = (
+        # In the top-k order: best first, ties by athlete id
+        Index(
+            "ix_leaderboard_best_relay",
+            "period",
+            column("best_relay").desc(),
+            "athlete_id",
+        ),
+        Index(
+            "ix_leaderboard_average_score",
+            "period",
+            column("average_score").desc(),
+            "athlete_id",
+        ),
+    )
+
+    period: str = Field(primary_key=True, max_length=7)
+    athlete_id: int = Field(primary_key=True)
+
+    best_relay: Optional[float] = None  # Best full relay total, None without one
+    average_score: float  # Mean match shot score
+    total_shots: int  # Match shots
@@ -1,11 +1,36 @@
 from datetime import date, time
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
+# Match shots are split into relays of this many shots, ordered by time
+RELAY_SIZE = 60
+
 
 class ShotLog(SQLModel, table=True):
     __tablename__ = "shot_log"
+    __table_args__ = (
+        # Reads filter on an athlete's date range and split on match_shot; the
+        # included columns are everything the shot endpoints return, so they
+        # are answered by index-only scans
+        Index(
+            "ix_shot_log_day",
+            "athlete_id",
+            "shot_date",
+            "match_shot",
+            postgresql_include=[
+                "shot_time",
+                "primary_score",
+                "secondary_score",
+                "x_mm",
+                "y_mm",
+                "relay_index",
+                "shot_number",
+            ],
+        ),
+        Index("ix_shot_log_relay", "athlete_id", "shot_date", "relay_index"),
+    )
 
     athlete_id: int = Field(primary_key=True)
     shot_time: time = Field(
@@ -40,6 +65,10 @@ class ShotLog(SQLModel, table=True):
     target_id: int  # Target ID
     external_number: Optional[int] = None  # External shooter ID
 
+    # Assigned at import from the day's shot order, see number_shots
+    relay_index: Optional[int] = None  # 1-based relay of a match shot
+    shot_number: Optional[int] = None  # Within the relay, or within the sighters
+
     import_date: date = Field(
         default_factory=date.today, description="Date the log entry was imported"
     )
@@ -0,0 +1,41 @@
+from datetime import date
+
+from sqlmodel import Field, SQLModel
+
+from app.db.models.common import TimestampModel
+
+
+class DailySummary(TimestampModel, table=True):
+    """Per athlete and day rollup of shot_log, maintained at import."""
+
+    __tablename__ = "daily_summary"
+
+    athlete_id: int = Field(primary_key=True)
+    shot_date: date = Field(primary_key=True)
+
+    total_shots: int  # Match shots
+    total_sighters: int
+    total_score: float  # Sum of match shot primary scores
+    # Sum of squared match shot primary scores, for standard deviations
+    total_score_squares: float = Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )
+    best_score: float  # Best match shot primary score, 0 without match shots
+    # athlete_version.version of the import that last wrote the row. Imports
+    # of an athlete bump it in turn, holding the row lock until they commit,
+    # so versions become visible in order, unlike updated_at
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+
+class RelaySummary(SQLModel, table=True):
+    """Per relay rollup of a day's match shots, maintained at import."""
+
+    __tablename__ = "relay_summary"
+
+    athlete_id: int = Field(primary_key=True)
+    shot_date: date = Field(primary_key=True)
+    relay_index: int = Field(primary_key=True)  # 1-based, 60 shots per relay
+
+    total_shots: int
+    total_score: float
+    best_score: float
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger
+from sqlmodel import Field
+
+from app.db.models.common import TimestampModel
+
+
+class TailOffset(TimestampModel, table=True):
+    """
+    How far the tail daemon has ingested a SIUS log file.
+
+    Written in the same transaction as the shots read up to ``byte_offset``,
+    so a restarted daemon resumes exactly after the last committed line.
+    """
+
+    __tablename__ = "tail_offsets"
+
+    path: str = Field(primary_key=True, description="Absolute path of the log")
+    # Identifies the file behind ``path``, a new inode means it was rotated
+    inode: int = Field(sa_type=BigInteger)
+    byte_offset: int = Field(
+        sa_type=BigInteger, description="Bytes consumed, always at a line start"
+    )
+
+    def __repr__(self):
+        return f"<TailOffset (path: {self.path}, byte_offset: {self.byte_offset})>"
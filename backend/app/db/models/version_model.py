@@ -0,0 +1,17 @@
+from sqlmodel import Field
+
+from app.db.models.common import TimestampModel
+
+
+class AthleteVersion(TimestampModel, table=True):
+    """
+    Per athlete counter bumped by every import that changes their shots.
+
+    Cached responses are keyed on it, so they are invalidated across all
+    processes by the import transaction itself.
+    """
+
+    __tablename__ = "athlete_version"
+
+    athlete_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    version: int = 0
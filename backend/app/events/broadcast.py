@@ -0,0 +1,101 @@
+"""
+In-process fan-out of shot events to live streams.
+
+Each API process keeps one asyncpg connection LISTENing on the shot_events
+channel (see app.events.notify), so shots ingested by any process, upload
+or tail daemon, reach the streams of every worker. The connection is opened
+with the first subscriber and reopened with a backoff when it drops; after
+a reconnect every stream is woken, since events sent in between are lost.
+
+A subscriber is an asyncio.Event that is set when the athlete has new
+shots. Events arriving before the stream reads are coalesced into one
+wake-up, so a slow client never queues up work; streams read the shots
+stored after their cursor themselves.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+import asyncpg
+
+from app.config import settings
+from app.events.notify import CHANNEL, decode_payload
+
+RECONNECT_SECONDS = (0.5, 1, 2, 5, 10)
+
+logger = logging.getLogger(__name__)
+
+
+class ShotBroadcaster:
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Event]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, athlete_id: int) -> AsyncIterator[asyncio.Event]:
+        self._ensure_listener()
+        wake = asyncio.Event()
+        self._subscribers.setdefault(athlete_id, set()).add(wake)
+        try:
+            yield wake
+        finally:
+            subscribers = self._subscribers[athlete_id]
+            subscribers.discard(wake)
+            if not subscribers:
+                del self._subscribers[athlete_id]
+
+    def publish(self, athlete_ids: Iterable[int]) -> None:
+        for athlete_id in athlete_ids:
+            for wake in self._subscribers.get(athlete_id, ()):
+                wake.set()
+
+    def publish_all(self) -> None:
+        self.publish(list(self._subscribers))
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            _, athlete_ids = decode_payload(payload)
+        except (ValueError, KeyError) as e:
+            logger.warning("Ignoring malformed %s payload %r: %s", CHANNEL, payload, e)
+            return
+        self.publish(athlete_ids)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        dsn = settings.DB_URL.replace("+asyncpg", "")
+        failures = 0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if failures:
+                    # Events sent while disconnected are lost, let every
+                    # stream check for itself
+                    self.publish_all()
+                failures = 0
+                await closed.wait()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Shot event listener disconnected: %r", e)
+            except Exception:
+                # Anything else would end the listener for good, leaving every
+                # stream of this process without events
+                logger.exception("Shot event listener failed")
+            finally:
+                if connection is not None:
+                    # Unlike close(), cannot fail on a broken connection
+                    connection.terminate()
+            await asyncio.sleep(
+                RECONNECT_SECONDS[min(failures, len(RECONNECT_SECONDS) - 1)]
+            )
+            failures += 1
+
+
+shot_broadcaster = ShotBroadcaster()
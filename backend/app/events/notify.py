@@ -0,0 +1,34 @@
+"""
+Shot events sent through Postgres NOTIFY.
+
+The import path calls ``notify_shots`` inside its transaction, so the event
+is delivered to every listening process exactly when the shots become
+visible, and never for an import that rolls back. The payload only names
+the athletes and the day; listeners read the shots themselves.
+"""
+
+import json
+from datetime import date
+from itertools import batched
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+CHANNEL = "shot_events"
+# NOTIFY payloads are limited to 8000 bytes
+_IDS_PER_NOTIFY = 500
+
+
+def encode_payload(shot_date: date, athlete_ids: Iterable[int]) -> str:
+    return json.dumps({"date": shot_date.isoformat(), "athletes": list(athlete_ids)})
+
+
+def decode_payload(payload: str) -> Tuple[date, List[int]]:
+    event = json.loads(payload)
+    return date.fromisoformat(event["date"]), event["athletes"]
+
+
+def notify_shots(session: Session, shot_date: date, athlete_ids: Iterable[int]) -> None:
+    for ids in batched(sorted(athlete_ids), _IDS_PER_NOTIFY):
+        session.execute(select(func.pg_notify(CHANNEL, encode_payload(shot_date, ids))))
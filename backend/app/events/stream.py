@@ -0,0 +1,72 @@
+"""
+Server-sent events stream of an athlete's new shots.
+
+A stream follows one day. Every event carries the shots stored since the
+previous one and the day's updated day and relay totals, and its id is the
+time of its last shot, so a reconnecting EventSource resumes from
+Last-Event-ID without gaps or repeats. Only shots later than the cursor are
+sent: a late shot stamped before it, or a rewritten one, shows in the
+totals but not as a delta.
+"""
+
+import asyncio
+from datetime import date, time
+from typing import AsyncIterator, Optional
+
+from app.api.responses import dumps_json
+from app.cache.responses import render
+from app.crud.shots_crud import get_last_shot_time, get_shots_after
+from app.events.broadcast import shot_broadcaster
+
+# Comment lines keep proxies from closing an idle stream
+KEEPALIVE_SECONDS = 15
+# How long the browser waits before reconnecting
+RETRY_MILLISECONDS = 2000
+
+
+def format_event(event: str, data: bytes, event_id: Optional[time] = None) -> bytes:
+    lines = [f"event: {event}".encode()]
+    if event_id is not None:
+        lines.append(f"id: {event_id.isoformat()}".encode())
+    lines.append(b"data: " + data)
+    return b"\n".join(lines) + b"\n\n"
+
+
+def _field(value, name: str):
+    # The crud layer builds plain dicts with FAST_SERIALIZATION
+    return value[name] if isinstance(value, dict) else getattr(value, name)
+
+
+async def shot_stream(
+    athlete_id: int, shot_date: date, cursor: Optional[time]
+) -> AsyncIterator[bytes]:
+    """
+    Events for the shots ``athlete_id`` fires on ``shot_date`` after
+    ``cursor``. Without a cursor the stream starts at the latest stored
+    shot, announced by a ``ready`` event.
+    """
+    async with shot_broadcaster.subscribe(athlete_id) as wake:
+        # Subscribed before reading, so a shot landing in between still wakes
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        if cursor is None:
+            cursor = await get_last_shot_time(athlete_id, shot_date)
+            yield format_event(
+                "ready", dumps_json({"date": shot_date, "after": cursor}), cursor
+            )
+        else:
+            # Send what was missed while disconnected
+            wake.set()
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            wake.clear()
+            delta = await get_shots_after(athlete_id, shot_date, cursor)
+            shots = _field(delta, "shots")
+            if not shots:
+                # Shots of another day, or rewritten ones
+                continue
+            cursor = _field(shots[-1], "shot_time")
+            yield format_event("shots", render(delta), cursor)
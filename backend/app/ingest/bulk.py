@@ -0,0 +1,165 @@
+import csv
+import io
+import time
+from typing import Iterable, Literal, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Table, column, insert, table, text
+from sqlalchemy.sql import TableClause
+from sqlmodel import Session
+
+
+class BulkResult(BaseModel):
+    rows: int = 0
+    seconds: float = 0.0
+    method: str = "copy"
+
+
+class MergeResult(BulkResult):
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+
+def _supports_copy(session: Session) -> bool:
+    """COPY is only available on Postgres through a psycopg2 cursor."""
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return False
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        return hasattr(cursor, "copy_expert")
+    finally:
+        cursor.close()
+
+
+def copy_rows(
+    session: Session, table: TableClause, columns: Sequence[str], rows: Iterable[tuple]
+) -> int:
+    """Stream rows into ``table`` with a single ``COPY ... FROM STDIN``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        # None must be written as an unquoted empty field to be read as NULL
+        writer.writerow(["" if value is None else value for value in row])
+        count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+    return count
+
+
+def executemany_rows(
+    session: Session, table: TableClause, columns: Sequence[str], rows: Iterable[tuple]
+) -> int:
+    """Fallback for drivers without COPY: one batched ``executemany`` insert."""
+    params = [dict(zip(columns, row)) for row in rows]
+    if not params:
+        return 0
+    session.execute(insert(table), params)
+    return len(params)
+
+
+def bulk_insert(
+    session: Session,
+    table: TableClause,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    use_copy: bool = True,
+) -> BulkResult:
+    """
+    Insert ``rows`` (tuples ordered like ``columns``) into ``table``.
+
+    Uses ``COPY`` when the connection supports it and falls back to a batched
+    ``executemany``. The caller owns the transaction and commits.
+    """
+    start = time.perf_counter()
+    if use_copy and _supports_copy(session):
+        count = copy_rows(session, table, columns, rows)
+        method = "copy"
+    else:
+        count = executemany_rows(session, table, columns, rows)
+        method = "executemany"
+    return BulkResult(rows=count, seconds=time.perf_counter() - start, method=method)
+
+
+def _staging_table(session: Session, target: Table, columns: Sequence[str]):
+    """Per-transaction temp table shaped like ``target``, without its keys."""
+    name = f"{target.name}_staging"
+    session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {name} "
+            f"(LIKE {target.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    return table(name, *(column(c) for c in columns))
+
+
+def merge_rows(
+    session: Session,
+    target: Table,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    on_conflict: Literal["nothing", "update"] = "update",
+    compare_exclude: Sequence[str] = (),
+    use_copy: bool = True,
+) -> MergeResult:
+    """
+    Upsert ``rows`` into ``target`` (Postgres only).
+
+    Rows are bulk loaded into a temp staging table and merged with one
+    ``INSERT ... SELECT ... ON CONFLICT`` on the primary key. With ``update``
+    only rows whose values differ (ignoring ``compare_exclude``) are rewritten;
+    identical rows are counted as skipped.
+    """
+    start = time.perf_counter()
+    staging = _staging_table(session, target, columns)
+    loaded = bulk_insert(session, staging, columns, rows, use_copy=use_copy)
+    if not loaded.rows:
+        return MergeResult(method=loaded.method)
+
+    keys = [c.name for c in target.primary_key.columns]
+    values = [c for c in columns if c not in keys]
+    column_list = ", ".join(columns)
+    if on_conflict == "update":
+        compared = [c for c in values if c not in compare_exclude]
+        conflict = (
+            f"DO UPDATE SET {', '.join(f'{c} = EXCLUDED.{c}' for c in values)} "
+            f"WHERE ({', '.join(f'{target.name}.{c}' for c in compared)}) "
+            f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in compared)})"
+        )
+    else:
+        conflict = "DO NOTHING"
+    # DISTINCT ON keeps a key repeated within the batch from hitting the same
+    # target row twice, which ON CONFLICT DO UPDATE rejects. xmax is 0 only
+    # for freshly inserted tuples.
+    inserted, updated = session.execute(
+        text(
+            f"WITH merged AS ("
+            f"INSERT INTO {target.name} ({column_list}) "
+            f"SELECT DISTINCT ON ({', '.join(keys)}) {column_list} "
+            f"FROM {staging.name} "
+            f"ON CONFLICT ({', '.join(keys)}) {conflict} "
+            f"RETURNING (xmax = 0) AS inserted) "
+            f"SELECT count(*) FILTER (WHERE inserted), "
+            f"count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+    ).one()
+    session.execute(text(f"TRUNCATE {staging.name}"))
+
+    return MergeResult(
+        rows=loaded.rows,
+        inserted=inserted,
+        updated=updated,
+        skipped=loaded.rows - inserted - updated,
+        seconds=time.perf_counter() - start,
+        method=loaded.method,
+    )
@@ -0,0 +1,45 @@
+import codecs
+import hashlib
+from itertools import batched
+from typing import BinaryIO, Iterator
+
+
+def iter_lines(
+    fileobj: BinaryIO, chunk_size: int, encoding: str = "utf-8"
+) -> Iterator[str]:
+    """
+    Yield decoded lines from ``fileobj`` while reading at most ``chunk_size``
+    bytes at a time. Multi-byte characters and CRLF pairs split across chunk
+    boundaries are handled by carrying the incomplete tail to the next chunk.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            line = line.rstrip("\r")
+            if line:
+                yield line
+    tail = (tail + decoder.decode(b"", final=True)).rstrip("\r")
+    if tail:
+        yield tail
+
+
+def iter_line_batches(
+    fileobj: BinaryIO, batch_size: int, chunk_size: int
+) -> Iterator[tuple[str, ...]]:
+    """Yield SIUS log lines from ``fileobj`` in batches of ``batch_size``."""
+    yield from batched(iter_lines(fileobj, chunk_size), batch_size)
+
+
+def hash_file(fileobj: BinaryIO, chunk_size: int) -> str:
+    """SHA-256 hex digest of ``fileobj``, which is rewound afterwards."""
+    digest = hashlib.sha256()
+    while chunk := fileobj.read(chunk_size):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
@@ -0,0 +1,87 @@
+import os
+from typing import BinaryIO, List, NamedTuple, Optional
+
+
+class TailChunk(NamedTuple):
+    lines: List[str]
+    inode: int
+    # Offset just past the last returned line
+    end_offset: int
+
+
+class LogTail:
+    """
+    Complete lines appended to a log file since a byte offset.
+
+    ``poll`` returns what was appended without moving the offset; the caller
+    stores the lines and then calls ``commit``, so a failed store is simply
+    read again. The file stays open between polls: when the range rotates it
+    (renames or replaces it), the old file is drained, its unterminated last
+    line included, before the new file at ``path`` is followed from its
+    start. A file truncated below the offset is read again from the start.
+    """
+
+    def __init__(self, path: str, inode: Optional[int] = None, offset: int = 0):
+        self.path = path
+        self.inode = inode
+        self.offset = offset
+        self._file: Optional[BinaryIO] = None
+
+    def _open(self) -> bool:
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        inode = os.fstat(self._file.fileno()).st_ino
+        if inode != self.inode:
+            # The stored offset belongs to another file
+            self.inode, self.offset = inode, 0
+        return True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotated(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return True
+
+    def poll(self, max_bytes: int) -> Optional[TailChunk]:
+        """
+        Lines appended since the offset, ``max_bytes`` of them at most unless
+        the first line alone is longer.
+        """
+        if self._file is None and not self._open():
+            return None
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.offset:
+            self.offset = 0
+        self._file.seek(self.offset)
+        parts = [self._file.read(max_bytes)]
+        # Read on to the end of a line longer than max_bytes, which would
+        # otherwise never be returned and hold up the rest of the file
+        while len(parts[-1]) == max_bytes and b"\n" not in parts[-1]:
+            parts.append(self._file.read(max_bytes))
+        data = b"".join(parts)
+        end = data.rfind(b"\n") + 1
+        if not end and self._rotated():
+            # Nothing more will be written here, an unterminated line is final
+            end = len(data)
+            if not end:
+                self.close()
+                return self.poll(max_bytes) if self._open() else None
+        if not end:
+            return None
+        lines = [
+            line.rstrip("\r")
+            for line in data[:end].decode("utf-8", errors="replace").split("\n")
+            if line.strip()
+        ]
+        return TailChunk(lines, self.inode, self.offset + end)
+
+    def commit(self, chunk: TailChunk) -> None:
+        if chunk.inode == self.inode:
+            self.offset = chunk.end_offset
@@ -1,10 +1,16 @@
-import uvicorn
-from app.api.v1 import athlete, import_file, login, shot
-from fastapi import FastAPI
+import secrets
+
+from app.api.responses import TimedJSONResponse
+from app.api.routers import LazyRouterMiddleware, include_routers
+from app.config import settings
+from app.metrics.middleware import InstrumentationMiddleware
+from app.metrics.registry import REGISTRY
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from mangum import Mangum
 
-app = FastAPI()
+app = FastAPI(default_response_class=TimedJSONResponse)
 
 # Allow all CORS for local testing
 app.add_middleware(
@@ -21,13 +27,44 @@ def health_check():
     return {"status": "ok"}
 
 
-app.include_router(import_file.router, prefix="/api/v1/import", tags=["Import"])
-app.include_router(login.router, prefix="/api/v1", tags=["login"])
-app.include_router(athlete.router, prefix="/api/v1/athlete", tags=["Athletes"])
-app.include_router(shot.router, prefix="/api/v1/shots", tags=["Shots"])
+if settings.LAZY_STARTUP:
+    app.add_middleware(
+        LazyRouterMiddleware,
+        docs_paths=(app.openapi_url, app.docs_url, app.redoc_url),
+    )
+else:
+    include_routers(app)
+
+# Added last so it is the outermost middleware and times everything above
+if settings.METRICS_ENABLED:
+    app.add_middleware(InstrumentationMiddleware)
+
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics(authorization: str = Header("")):
+        # A static token, as scrapers cannot log in for a user token
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(authorization.encode(), expected.encode()):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
+if settings.PREWARM_PASSWORD_HASH:
+    from app.security.hash import warm_up
+
+    warm_up()
 
 handler = Mangum(app)
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,80 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.registry import REGISTRY
+from app.metrics.timing import RequestTimings, current_timings
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Request latency until the response is complete.",
+    ("method", "route"),
+)
+REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requests served.", ("method", "route", "status")
+)
+REQUEST_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries",
+    "SQL statements run by one request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_SECONDS = REGISTRY.counter(
+    "http_request_db_seconds_total",
+    "Time spent in SQL statements.",
+    ("method", "route"),
+)
+SERIALIZE_SECONDS = REGISTRY.counter(
+    "http_request_serialize_seconds_total",
+    "Time spent encoding response bodies.",
+    ("method", "route"),
+)
+
+
+def route_label(scope: Scope) -> str:
+    # The route template, never the raw path, keeps label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """
+    Time every HTTP request, attribute its SQL and serialization time and
+    report the breakdown in a ``Server-Timing`` header and in the registry.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    timings.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            labels = {"method": scope["method"], "route": route_label(scope)}
+            REQUEST_DURATION.observe(time.perf_counter() - started, **labels)
+            REQUESTS.inc(**labels, status=status)
+            REQUEST_QUERIES.observe(timings.queries, **labels)
+            DB_SECONDS.inc(timings.db_seconds, **labels)
+            SERIALIZE_SECONDS.inc(timings.serialize_seconds, **labels)
@@ -0,0 +1,33 @@
+import time
+
+from sqlalchemy import Engine, event
+
+from app.metrics.timing import current_timings
+
+_STARTED = "query_started"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count the queries ``engine`` runs, and their time, against the current
+    request. For an AsyncEngine pass its ``sync_engine``; the events fire in
+    the task awaiting the query, so the request context is visible.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info[_STARTED].pop()
+        timings = current_timings.get()
+        if timings is not None:
+            timings.add_query(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_STARTED):
+            conn.info[_STARTED].pop()
@@ -0,0 +1,52 @@
+"""
+Per-request timing breakdown.
+
+The instrumentation middleware puts a ``RequestTimings`` in a context
+variable; the engine events add every query to it and serializers wrap their
+work in ``timed_serialization``. Work done outside a request, or on a thread
+the context was not copied to (the import pool), is not attributed.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class RequestTimings:
+    __slots__ = ("queries", "db_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def add_query(self, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        """``Server-Timing`` header value, durations in milliseconds."""
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="queries: {self.queries}", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialize_seconds += time.perf_counter() - started
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    athlete_id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    best_relay: Optional[float] = None
+    average_score: float
+    total_shots: int
+
+
+class Leaderboard(BaseModel):
+    period: str
+    metric: str
+    entries: List[LeaderboardRow]
+    # The requesting athlete's standing, also when outside the top entries
+    me: Optional[LeaderboardRow] = None
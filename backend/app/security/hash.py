@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -24,6 +26,30 @@ def get_password_hash(password) -> str:
     return pwd_context.hash(password)
 
 
+def warm_up() -> None:
+    """Load passlib's bcrypt backend now instead of on the first login."""
+    pwd_context.handler("bcrypt").get_backend()
+
+
+# bcrypt is deliberately slow (~250 ms) and releases the GIL, so it runs on a
+# small pool instead of the event loop; the pool size caps the CPU logins use
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
 def create_jwt_token(
     data: dict,
     expires_delta: timedelta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
@@ -44,4 +70,4 @@ def decode_jwt_token(token: str) -> dict:
         )
         return payload
     except InvalidTokenError:
-        credentials_exception
+        raise credentials_exception
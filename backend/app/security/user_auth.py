@@ -2,18 +2,23 @@ from typing import Annotated, Optional
 
 from app.crud.user_crud import get_user, get_user_by_any_identifier
 from app.db.models.user_model import User
-from app.security.hash import credentials_exception, decode_jwt_token, verify_password
+from app.security.hash import (
+    credentials_exception,
+    decode_jwt_token,
+    verify_password_async,
+)
+from app.security.user_cache import user_cache
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 
 
-def authenticate_user(username: str, password: str) -> Optional[User]:
+async def authenticate_user(username: str, password: str) -> Optional[User]:
     # Use the new function that supports username, email, or member number
-    user = get_user_by_any_identifier(username)
+    user = await get_user_by_any_identifier(username)
     if not user:
         return False
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
@@ -26,9 +31,14 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     username = payload.get("sub")
     if username is None:
         raise credentials_exception
-    user = get_user(username=username)
+    # Steady state authorization needs no query, see UserCache
+    expires = payload.get("exp")
+    user = user_cache.get(username, expires)
     if user is None:
-        raise credentials_exception
+        user = await get_user(username=username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(username, expires, user)
     return user
 
 
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+from app.db.models.user_model import User
+from app.metrics.registry import REGISTRY
+
+
+class UserCache:
+    """
+    TTL/LRU cache of users resolved from access tokens.
+
+    Keyed by (username, token expiry): an entry never outlives its token nor
+    ``ttl`` seconds, which also bounds how long a change made by another
+    process goes unnoticed. Changes made through user_crud invalidate the
+    user right away. Cached users are shared, treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str, expires: Optional[float]) -> Optional[User]:
+        key = (username, expires)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, username: str, expires: Optional[float], user: User) -> None:
+        valid_until = time.time() + self.ttl
+        if expires is not None:
+            valid_until = min(valid_until, expires)
+        with self._lock:
+            self._entries[(username, expires)] = (valid_until, user)
+            self._entries.move_to_end((username, expires))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """Drop every cached token of ``username``, or everything."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == username]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+user_cache = UserCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+REGISTRY.callback(
+    "user_cache_hits_total",
+    "Tokens resolved from the user cache.",
+    "counter",
+    lambda: user_cache.hits,
+)
+REGISTRY.callback(
+    "user_cache_misses_total",
+    "Tokens that needed a users query.",
+    "counter",
+    lambda: user_cache.misses,
+)
+REGISTRY.callback(
+    "user_cache_entries",
+    "Tokens currently cached.",
+    "gauge",
+    lambda: user_cache.stats()["size"],
+)
@@ -0,0 +1,109 @@
+"""
+Benchmark the columnar SIUS decoder against the original per-row parser.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_decoder --rows 60000
+"""
+
+import argparse
+import csv
+import random
+import timeit
+from datetime import date, datetime
+
+from app.ingest.decoder import decode_lines
+
+
+def per_row_reference(row: list, shot_date: date, import_date: date) -> tuple:
+    """The per-row conversion load_csv_file used before the columnar decoder."""
+    shot_time_obj = datetime.strptime(row[6], "%H:%M:%S.%f").time()
+    return (
+        int(row[0]),
+        float(row[1]),
+        int(row[2]),
+        int(row[3]),
+        float(row[4]),
+        int(row[5]),
+        shot_time_obj,
+        bool(int(row[7])),
+        float(row[8]),
+        float(row[9]),
+        bool(int(row[10])),
+        float(row[11]),
+        int(row[12]),
+        bool(int(row[13])),
+        int(row[14]),
+        int(row[15]),
+        int(row[16]),
+        int(row[17]),
+        int(row[18]),
+        int(row[19]),
+        int(row[20]),
+        int(row[21]),
+        float(row[22]),
+        int(row[23]),
+        int(row[24]),
+        int(row[25]),
+        int(row[26]),
+        int(row[27]) if row[27] else None,
+        shot_date,
+        import_date,
+    )
+
+
+def make_lines(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        seconds = 8 * 3600 + i * 7 % (12 * 3600)
+        lines.append(
+            f"{1000 + i % 8};{rng.randint(6, 10)};{int(i % 70 >= 10)};{i % 8 + 1};"
+            f"{rng.uniform(6, 10.9):.1f};{rng.randint(0, 2500)};"
+            f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}."
+            f"{rng.randint(0, 99):02d};{rng.randint(0, 1)};{rng.uniform(-15, 15):.2f};"
+            f"{rng.uniform(-15, 15):.2f};1;{rng.randint(0, 9000)};0;0;1;0;0;0;0;1;"
+            f"{i};3;{rng.randint(0, 10**9)};1;2;2;{i % 8 + 1};"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=60_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = make_lines(args.rows)
+    shot_date = date(2025, 5, 1)
+    today = date.today()
+
+    def reference():
+        reader = csv.reader(lines, delimiter=";")
+        return [per_row_reference(row, shot_date, today) for row in reader]
+
+    def decode_only():
+        return decode_lines(lines, shot_date)
+
+    def decode_to_rows():
+        return list(decode_lines(lines, shot_date).iter_rows(today))
+
+    assert reference() == decode_to_rows(), "decoder output differs from reference"
+
+    timings = {
+        "per-row reference": reference,
+        "columnar decode": decode_only,
+        "columnar decode + rows": decode_to_rows,
+    }
+    baseline = None
+    for label, func in timings.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(
+            f"{label:<24} {best * 1000:9.1f} ms  "
+            f"{args.rows / best:12,.0f} rows/s  x{baseline / best:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
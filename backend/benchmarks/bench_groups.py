@@ -0,0 +1,101 @@
+"""
+Benchmark the vectorized group metrics against a pure-Python reference.
+
+Groups are shaped like a /recent-scores response: two 60 shot relays per day
+plus the day's 120 match shots. Run from the backend directory:
+
+    python -m benchmarks.bench_groups --days 90
+"""
+
+import argparse
+import math
+import random
+import timeit
+
+import numpy as np
+
+from app.analytics.groups import GROUP_METRICS, group_metrics
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    position = (len(sorted_values) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    low, high = sorted_values[lower], sorted_values[upper]
+    return low + (high - low) * (position - lower)
+
+
+def reference_metrics(xs: list, ys: list) -> dict:
+    """One group at a time, in plain Python."""
+    n = len(xs)
+    mpi_x = sum(xs) / n
+    mpi_y = sum(ys) / n
+    radii = [math.hypot(x - mpi_x, y - mpi_y) for x, y in zip(xs, ys)]
+    sorted_radii = sorted(radii)
+    return {
+        "mpi_x": mpi_x,
+        "mpi_y": mpi_y,
+        "extreme_spread": max(
+            math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+            for i in range(n)
+            for j in range(i, n)
+        ),
+        "width": max(xs) - min(xs),
+        "height": max(ys) - min(ys),
+        "mean_radius": sum(radii) / n,
+        "radial_sd": math.sqrt(sum(r * r for r in radii) / n),
+        "r50": percentile(sorted_radii, 0.5),
+        "r90": percentile(sorted_radii, 0.9),
+    }
+
+
+def make_groups(days: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    groups = []
+    for _ in range(days):
+        relays = [
+            [(rng.gauss(0, 5), rng.gauss(0, 5)) for _ in range(60)] for _ in range(2)
+        ]
+        groups.extend(relays)
+        groups.append(relays[0] + relays[1])
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    groups = make_groups(args.days)
+    x = np.array([x for group in groups for x, _ in group])
+    y = np.array([y for group in groups for _, y in group])
+    group_ids = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+
+    def reference():
+        return [
+            reference_metrics([x for x, _ in group], [y for _, y in group])
+            for group in groups
+        ]
+
+    def vectorized():
+        return group_metrics(x, y, group_ids, len(groups))
+
+    expected = reference()
+    actual = vectorized()
+    for name in GROUP_METRICS:
+        assert np.allclose(actual[name], [m[name] for m in expected]), name
+
+    print(f"{len(groups)} groups, {len(x):,} shots")
+    baseline = None
+    for label, func in (("pure Python", reference), ("NumPy batch", vectorized)):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(
+            f"{label:<12} {best * 1000:8.1f} ms  "
+            f"{len(groups) / best:10,.0f} groups/s  x{baseline / best:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark loading shots as full ShotLog rows against the projected columns
+the shot endpoints now select.
+
+Synthetic days for one athlete are inserted in a transaction that is rolled
+back at the end, so the database is left as it was. Run from the backend
+directory against a migrated database:
+
+    python -m benchmarks.bench_hydration --shots-per-day 120
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import text
+from sqlmodel import and_, select
+
+from app.crud.import_crud import SHOT_LOG_COLUMNS
+from app.crud.shots_crud import select_shots
+from app.crud.summary_crud import number_shots
+from app.db.db import get_sync_session
+from app.db.models import ShotLog
+from app.ingest.bulk import bulk_insert
+from app.ingest.decoder import decode_lines
+from benchmarks.bench_decoder import make_lines
+
+
+def seed(session, athlete_id: int, end_date: date, days: int, shots_per_day: int):
+    lines = make_lines(shots_per_day)
+    for offset in range(days):
+        columns = decode_lines(lines, end_date - timedelta(days=offset))
+        columns.arrays["athlete_id"] = np.full(len(columns), athlete_id)
+        bulk_insert(
+            session, ShotLog.__table__, SHOT_LOG_COLUMNS, columns.iter_rows(end_date)
+        )
+    number_shots(session, athlete_ids=[athlete_id])
+    session.execute(text("ANALYZE shot_log"))
+
+
+def orm_rows(athlete_id: int, start_date: date, end_date: date):
+    """The full-row query the endpoints ran before projection."""
+    return select(ShotLog).where(
+        and_(
+            ShotLog.athlete_id == athlete_id,
+            ShotLog.shot_date >= start_date,
+            ShotLog.shot_date <= end_date,
+        )
+    )
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--athlete-id", type=int, default=-1)
+    parser.add_argument("--shots-per-day", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    end_date = date.today()
+    with get_sync_session() as session:
+        seed(session, args.athlete_id, end_date, 90, args.shots_per_day)
+
+        for days in (10, 90):
+            start_date = end_date - timedelta(days=days - 1)
+            queries = {
+                "select(ShotLog)": orm_rows(args.athlete_id, start_date, end_date),
+                "projected columns": select_shots(
+                    args.athlete_id, start_date, end_date
+                ),
+            }
+            print(f"{days}-day window, {days * args.shots_per_day:,} shots")
+            baseline = None
+            for label, statement in queries.items():
+
+                def load():
+                    rows = session.exec(statement).all()
+                    session.expunge_all()
+                    return rows
+
+                best = min(timeit.repeat(load, number=1, repeat=args.repeat))
+                peak = peak_memory(load)
+                baseline = baseline or best
+                print(
+                    f"  {label:<18} {best * 1000:8.1f} ms  "
+                    f"{peak / 1024:9,.0f} KiB peak  x{baseline / best:5.1f}"
+                )
+        session.rollback()
+
+
+if __name__ == "__main__":
+    main()
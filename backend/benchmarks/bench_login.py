@@ -0,0 +1,106 @@
+"""
+Benchmark concurrent logins against POST /api/v1/token.
+
+Fires ``--logins`` token requests, ``--concurrency`` at a time, through the
+ASGI app while a probe pings /health, and reports logins/s and the worst
+probe latency: the stall one login inflicts on every other request. The
+``inline`` run verifies bcrypt on the event loop like the old code did.
+Needs the database; a throwaway user is created and removed. Run from the
+backend directory:
+
+    python -m benchmarks.bench_login --logins 64 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlmodel import delete
+
+import app.security.user_auth as user_auth
+from app.crud.user_crud import create_user, get_user
+from app.db import db
+from app.db.models import User, UserCreate
+from app.main import app
+from app.security.hash import verify_password, verify_password_async
+
+USERNAME = "bench-login"
+PASSWORD = "bench-login-password"
+
+
+async def verify_inline(plain_password, hashed_password) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        worst = max(worst, time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+    return worst
+
+
+async def run(logins: int, concurrency: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with semaphore:
+                response = await client.post(
+                    "/api/v1/token", data={"username": USERNAME, "password": PASSWORD}
+                )
+                response.raise_for_status()
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        return logins / elapsed, await prober
+
+
+async def bench(args):
+    if await get_user(USERNAME) is None:
+        await create_user(
+            UserCreate(
+                username=USERNAME,
+                email=f"{USERNAME}@example.com",
+                full_name="Login Benchmark",
+                password=PASSWORD,
+            )
+        )
+    try:
+        for label, verify in (
+            ("inline", verify_inline),
+            ("executor", verify_password_async),
+        ):
+            user_auth.verify_password_async = verify
+            rate, stall = await run(args.logins, args.concurrency)
+            print(
+                f"{label:<9} {rate:8.1f} logins/s  worst /health {stall * 1000:8.1f} ms"
+            )
+    finally:
+        user_auth.verify_password_async = verify_password_async
+        with db.get_sync_session() as session:
+            session.exec(delete(User).where(User.username == USERNAME))
+            session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    db.sync_engine.echo = False
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark building and encoding a /recent-scores response with validated
+pydantic models against FAST_SERIALIZATION's plain dicts.
+
+Works on synthetic rows shaped like select_shots results, no database needed.
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization --days 90 --shots-per-day 120
+"""
+
+import argparse
+import random
+import timeit
+from collections import namedtuple
+from datetime import date, time, timedelta
+
+from app.api.responses import orjson
+from app.cache.responses import render
+from app.config import settings
+from app.crud.shots_crud import SHOT_COLUMNS, create_day_stats
+from app.db.models import RELAY_SIZE
+
+ShotRow = namedtuple("ShotRow", [column.key for column in SHOT_COLUMNS])
+
+
+def make_days(days: int, shots_per_day: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    sighters = shots_per_day // 8
+    result = {}
+    for offset in range(days):
+        day = date.today() - timedelta(days=offset)
+        rows = []
+        for i in range(shots_per_day):
+            match_shot = int(i >= sighters)
+            position = i - sighters if match_shot else i
+            seconds = 8 * 3600 + i * 45
+            rows.append(
+                ShotRow(
+                    shot_date=day,
+                    match_shot=match_shot,
+                    relay_index=position // RELAY_SIZE + 1 if match_shot else None,
+                    shot_time=time(
+                        seconds // 3600,
+                        seconds // 60 % 60,
+                        seconds % 60,
+                        rng.randint(0, 99) * 10_000,
+                    ),
+                    shot_number=position % RELAY_SIZE + 1 if match_shot else i + 1,
+                    primary_score=float(rng.randint(6, 10)),
+                    secondary_score=round(rng.uniform(6, 10.9), 1),
+                    x_mm=round(rng.uniform(-15, 15), 2),
+                    y_mm=round(rng.uniform(-15, 15), 2),
+                )
+            )
+        result[day] = rows
+    return result
+
+
+def build_and_render(days: dict) -> bytes:
+    return render([create_day_stats(d, days[d]) for d in sorted(days, reverse=True)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--shots-per-day", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    days = make_days(args.days, args.shots_per_day)
+    shots = args.days * args.shots_per_day
+    encoder = "orjson" if orjson is not None else "json"
+
+    bodies = {}
+    baseline = None
+    for fast, label in ((False, "pydantic models"), (True, f"dicts + {encoder}")):
+        settings.FAST_SERIALIZATION = fast
+        bodies[fast] = build_and_render(days)
+        best = min(
+            timeit.repeat(lambda: build_and_render(days), number=1, repeat=args.repeat)
+        )
+        baseline = baseline or best
+        print(
+            f"{label:<18} {best * 1000:8.1f} ms  "
+            f"{shots / best:12,.0f} shots/s  x{baseline / best:5.1f}"
+        )
+    assert bodies[False] == bodies[True], "fast serialization changed the JSON"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Cold-start budget for the Lambda handler, measured with ``python -X importtime``.
+
+Imports ``app.main`` in fresh interpreters with LAZY_STARTUP off and on and
+reports the median import time, the slowest modules and the imported package
+count. Exits non-zero when a mode exceeds its budget in
+benchmarks/cold_start_budget.json by more than the tolerance, or when lazy
+mode imports a module it is supposed to defer. Run from the backend
+directory:
+
+    python -m benchmarks.cold_start             # check against the budget
+    python -m benchmarks.cold_start --update    # record this machine's budget
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("cold_start_budget.json")
+MODES = {"eager": "false", "lazy": "true"}
+
+
+def import_profile(lazy: str) -> dict:
+    """Self and cumulative import microseconds per module of one cold start."""
+    env = {**os.environ, "LAZY_STARTUP": lazy}
+    env.setdefault("JWT_SECRET_KEY", "cold-start")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def measure(lazy: str, runs: int) -> tuple[float, dict]:
+    # The first run may still be writing .pyc files
+    import_profile(lazy)
+    profiles = [import_profile(lazy) for _ in range(runs)]
+    import_ms = statistics.median(p["app.main"][1] / 1000 for p in profiles)
+    return import_ms, profiles[-1]
+
+
+def deferred_violations(profile: dict, deferred: list) -> list:
+    """Deferred modules that were imported, directly or through a submodule."""
+    return [
+        module
+        for module in deferred
+        if any(name == module or name.startswith(module + ".") for name in profile)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument(
+        "--update", action="store_true", help="write the measured times as budget"
+    )
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    tolerance = budget["tolerance"]
+    failures = []
+    for mode, lazy in MODES.items():
+        limits = budget["modes"][mode]
+        import_ms, profile = measure(lazy, args.runs)
+        packages = Counter(name.split(".")[0] for name in profile)
+        print(
+            f"{mode:<6} import {import_ms:8.1f} ms  budget {limits['import_ms']:8.1f} ms"
+            f"  {len(profile)} modules from {len(packages)} packages"
+        )
+        slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, _) in slowest[: args.top]:
+            print(f"         {self_us / 1000:8.1f} ms  {name}")
+
+        if args.update:
+            limits["import_ms"] = round(import_ms, 1)
+            continue
+        if import_ms > limits["import_ms"] * (1 + tolerance):
+            failures.append(
+                f"{mode}: import took {import_ms:.1f} ms, budget is "
+                f"{limits['import_ms']:.1f} ms +{tolerance:.0%}"
+            )
+        violations = deferred_violations(profile, limits.get("deferred", []))
+        if violations:
+            failures.append(f"{mode}: imported at startup: {', '.join(violations)}")
+
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"budget written to {BUDGET_FILE}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
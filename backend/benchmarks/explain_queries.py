@@ -0,0 +1,85 @@
+"""
+Check that the shot read queries are planned on an index.
+
+Each query from shots_crud is EXPLAINed with sequential scans disabled, so a
+``Seq Scan`` in the plan means no index can serve it, whatever the table size.
+The primary key counts as a regression too: shot_time sits before shot_date
+in it, so it reads an athlete's whole history. Exits non-zero on a
+regression. Run from the backend directory against a migrated database:
+
+    python -m benchmarks.explain_queries
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from app.crud.shots_crud import select_set, select_shots
+from app.db.db import get_sync_session
+from app.db.models import ShotLog
+
+# An index whose leading columns don't cover the date filter
+SLOW_INDEXES = {"shot_log_pkey"}
+
+
+def iter_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def explain(session, statement) -> dict:
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    (plan,) = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    return plan["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--athlete-id", type=int)
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    with get_sync_session() as session:
+        athlete_id = args.athlete_id
+        if athlete_id is None:
+            athlete_id = session.exec(select(func.min(ShotLog.athlete_id))).one() or 0
+        queries = {
+            "recent scores (10 days)": select_shots(
+                athlete_id, args.date - timedelta(days=9), args.date
+            ),
+            "shots by day": select_shots(athlete_id, args.date, args.date),
+            "shots by set": select_set(athlete_id, args.date, 1),
+        }
+
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        failures = 0
+        for name, statement in queries.items():
+            plan = list(iter_nodes(explain(session, statement)))
+            regressed = any(
+                node["Node Type"] == "Seq Scan"
+                or node.get("Index Name") in SLOW_INDEXES
+                for node in plan
+            )
+            nodes = [
+                node["Node Type"]
+                + (f" using {node['Index Name']}" if "Index Name" in node else "")
+                for node in plan
+            ]
+            failures += regressed
+            status = "FAIL" if regressed else "ok"
+            print(f"{status:4} {name}: {' -> '.join(nodes)}")
+        session.rollback()
+
+    if failures:
+        sys.exit(f"{failures} of {len(queries)} queries are not served by an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Ingest and query benchmark suite on a synthetic SIUS dataset, reported as JSON.
+
+Creates (or reuses) a dedicated Postgres database, migrates it, empties it,
+then times load_csv_file over every generated day, the shot crud functions
+and the HTTP endpoints. The report records the commit, settings and dataset
+so runs can be compared; ``--baseline`` prints the change against an earlier
+report and fails on regressions. Run from the backend directory:
+
+    python -m benchmarks.suite --athletes 8 --days 30 --output bench.json
+    python -m benchmarks.suite --baseline bench.json
+
+Queries rely on Postgres features (COPY, ON CONFLICT, INCLUDE indexes, window
+functions), so there is no SQLite mode.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+from alembic import command
+from alembic.config import Config
+from fastapi import UploadFile
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.db import db
+from benchmarks.synthetic import SyntheticConfig, sius_files
+
+PASSWORD = "bench-suite-password"
+RECORDED_SETTINGS = (
+    "IMPORT_USE_COPY",
+    "IMPORT_BATCH_SIZE",
+    "IMPORT_ON_CONFLICT",
+    "CACHE_BACKEND",
+    "FAST_SERIALIZATION",
+    "LAZY_STARTUP",
+)
+
+
+def prepare_database(name: str) -> None:
+    """Point the app at ``name``, create it if needed, migrate and empty it."""
+    if name == settings.DB_BASE:
+        sys.exit(f"refusing to empty the application database {name!r}")
+    maintenance = create_engine(settings.SYNC_DB_URL, isolation_level="AUTOCOMMIT")
+    with maintenance.connect() as connection:
+        exists = connection.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name}
+        )
+        if not exists:
+            connection.execute(text(f'CREATE DATABASE "{name}"'))
+    maintenance.dispose()
+
+    # Engines are created on first use, so this redirects the whole app
+    settings._DB_BASE = name
+    command.upgrade(Config("alembic.ini"), "head")
+    db.sync_engine.echo = False
+    with db.sync_engine.begin() as connection:
+        tables = connection.scalars(
+            text(
+                "SELECT tablename FROM pg_tables WHERE schemaname = 'public' "
+                "AND tablename <> 'alembic_version'"
+            )
+        ).all()
+        connection.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+async def timed(call, repeat: int) -> dict:
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        await call(i)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def bench_ingest(config: SyntheticConfig) -> dict:
+    from app.crud.import_crud import load_csv_file
+
+    files = list(sius_files(config))
+    rows = 0
+    started = time.perf_counter()
+    per_file = []
+    for filename, content in files:
+        file_started = time.perf_counter()
+        result = await load_csv_file(UploadFile(io.BytesIO(content), filename=filename))
+        per_file.append(time.perf_counter() - file_started)
+        rows += result.rows
+    seconds = time.perf_counter() - started
+
+    async def reimport(i):
+        filename, content = files[i % len(files)]
+        await load_csv_file(UploadFile(io.BytesIO(content), filename=filename))
+
+    return {
+        "load_csv_file": {
+            **summarize(per_file),
+            "files": len(files),
+            "rows": rows,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(rows / seconds, 1),
+        },
+        "load_csv_file_duplicate": await timed(reimport, len(files)),
+    }
+
+
+async def bench_crud(config: SyntheticConfig, repeat: int) -> dict:
+    from app.crud.shots_crud import get_recent_scores, get_shots_by_day, get_stats
+
+    athletes = config.athlete_ids
+    days = min(config.days, 30)
+    return {
+        "get_recent_scores": await timed(
+            lambda i: get_recent_scores(athletes[i % len(athletes)], days), repeat
+        ),
+        "get_stats": await timed(
+            lambda i: get_stats(athletes[i % len(athletes)], f"{days}days"), repeat
+        ),
+        "get_shots_by_day": await timed(
+            lambda i: get_shots_by_day(athletes[i % len(athletes)], config.end_date),
+            repeat,
+        ),
+    }
+
+
+async def create_athlete_user(athlete_id: int) -> None:
+    from app.crud.athlete_crud import create_athlete
+    from app.crud.user_crud import create_user
+    from app.db.models import UserCreate
+    from app.schemas.athletes import AthleteCreate
+
+    await create_athlete(
+        AthleteCreate(id=athlete_id, first_name="Bench", last_name=str(athlete_id))
+    )
+    await create_user(
+        UserCreate(
+            username=f"bench-{athlete_id}",
+            email=f"bench-{athlete_id}@example.com",
+            full_name="Bench",
+            password=PASSWORD,
+            athlete_id=athlete_id,
+        )
+    )
+
+
+async def bench_http(config: SyntheticConfig, repeat: int) -> dict:
+    from app.main import app
+
+    athlete_id = config.athlete_ids[0]
+    await create_athlete_user(athlete_id)
+    days = min(config.days, 30)
+    endpoints = {
+        "recent_scores": f"/api/v1/shots/recent-scores?days={days}",
+        "stats": f"/api/v1/shots/stats?period={days}days",
+        "by_day": f"/api/v1/shots/by-day?date_={config.end_date}",
+        "by_set": f"/api/v1/shots/by-set?date_={config.end_date}&set_id=1",
+        "trend": "/api/v1/shots/trend",
+        "leaderboard": "/api/v1/leaderboard",
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        login = await client.post(
+            "/api/v1/token",
+            data={"username": str(athlete_id), "password": PASSWORD},
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = {}
+        for name, path in endpoints.items():
+            sizes = []
+
+            async def get(i):
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+                sizes.append(len(response.content))
+
+            results[f"http_{name}"] = {
+                **await timed(get, repeat),
+                "bytes": sizes[-1],
+            }
+        return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list:
+    """Print each timing against the baseline, return the regressions."""
+    regressions = []
+    for name, result in report["results"].items():
+        before = baseline["results"].get(name)
+        if not before or "median_ms" not in before:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1
+        flag = " REGRESSION" if ratio > 1 + max_regression else ""
+        print(
+            f"{name:<24} {before['median_ms']:10.2f} -> {result['median_ms']:10.2f} ms"
+            f"  x{ratio:5.2f}{flag}",
+            file=sys.stderr,
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+async def run(args, config: SyntheticConfig) -> dict:
+    results = {}
+    results.update(await bench_ingest(config))
+    results.update(await bench_crud(config, args.repeat))
+    results.update(await bench_http(config, args.repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default="sius_bench")
+    parser.add_argument("--athletes", type=int, default=8)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--relays", type=int, default=2)
+    parser.add_argument("--sighter-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    # The recent scores, stats and trend endpoints look back from today, so
+    # the dataset ends today unless told otherwise
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here, not stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        athletes=args.athletes,
+        days=args.days,
+        relays=args.relays,
+        sighter_ratio=args.sighter_ratio,
+        end_date=args.end_date,
+        seed=args.seed,
+    )
+    prepare_database(args.database)
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "dataset": {
+            **config.model_dump(mode="json"),
+            "total_shots": config.total_shots,
+        },
+        "settings": {name: getattr(settings, name) for name in RECORDED_SETTINGS},
+        "results": asyncio.run(run(args, config)),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
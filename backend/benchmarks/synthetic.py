@@ -0,0 +1,179 @@
+"""
+Deterministic synthetic SIUS shot logs.
+
+Produces one ``YYYYMMDD.csv`` file per day in the README's 28 column layout:
+each athlete fires ``sighters`` sighting shots followed by ``relays`` relays
+of RELAY_SIZE match shots. Shot positions are drawn around the centre and the
+decimal score, ring, divisions and inner ten flag are derived from them, so
+the data aggregates like real training days. The same config and seed always
+give the same bytes. Write a dataset from the backend directory with:
+
+    python -m benchmarks.synthetic --athletes 8 --days 30 --out /tmp/sius
+"""
+
+import argparse
+import math
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from pydantic import BaseModel
+
+from app.db.models import RELAY_SIZE
+
+# ISSF 10m air rifle: 10.9 at the centre, a ring every 2.5 mm
+RING_WIDTH_MM = 2.5
+SECONDS_PER_SHOT = 40
+
+
+class SyntheticConfig(BaseModel):
+    athletes: int = 8
+    days: int = 30
+    relays: int = 2
+    # Sighters as a share of all shots fired in a day
+    sighter_ratio: float = 0.1
+    # Last day of the dataset, the others precede it. Fixed, so the default
+    # dataset is the same on any day
+    end_date: date = date(2025, 6, 1)
+    first_athlete_id: int = 1000
+    # Shot dispersion around the centre, in mm
+    spread_mm: float = 4.0
+    seed: int = 0
+
+    @property
+    def match_shots(self) -> int:
+        return self.relays * RELAY_SIZE
+
+    @property
+    def sighters(self) -> int:
+        return round(self.match_shots * self.sighter_ratio / (1 - self.sighter_ratio))
+
+    @property
+    def athlete_ids(self) -> List[int]:
+        return list(range(self.first_athlete_id, self.first_athlete_id + self.athletes))
+
+    @property
+    def shot_dates(self) -> List[date]:
+        return [
+            self.end_date - timedelta(days=offset)
+            for offset in range(self.days - 1, -1, -1)
+        ]
+
+    @property
+    def total_shots(self) -> int:
+        return self.athletes * self.days * (self.sighters + self.match_shots)
+
+
+def shot_line(
+    rng: random.Random,
+    config: SyntheticConfig,
+    athlete_id: int,
+    lane: int,
+    shot_date: date,
+    seconds: float,
+    match_shot: int,
+    relay: int,
+    log_event: int,
+) -> str:
+    x = rng.gauss(0, config.spread_mm)
+    y = rng.gauss(0, config.spread_mm)
+    radius = math.hypot(x, y)
+    secondary = max(0.0, math.floor((10.9 - radius / RING_WIDTH_MM) * 10) / 10)
+    primary = int(secondary)
+    # Split whole centiseconds so rounding never produces a 60th second
+    centis = round(seconds * 100)
+    seconds_part, centis_part = divmod(centis, 100)
+    hours, rest = divmod(seconds_part, 3600)
+    minutes, rest = divmod(rest, 60)
+    year_start = datetime(shot_date.year, 1, 1)
+    time_of_year = (
+        datetime.combine(shot_date, datetime.min.time()) - year_start
+    ).total_seconds() * 100 + centis
+    fields = (
+        athlete_id,
+        primary,
+        match_shot,
+        lane,
+        f"{secondary:.1f}",
+        round(radius * 100),
+        f"{hours:02d}:{minutes:02d}:{rest:02d}.{centis_part:02d}",
+        int(radius < RING_WIDTH_MM / 2),
+        f"{x:.2f}",
+        f"{y:.2f}",
+        1,
+        rng.randint(100, 9000),
+        0,
+        0,
+        relay,
+        0,
+        0,
+        0,
+        0,
+        match_shot,
+        log_event,
+        3,
+        round(time_of_year),
+        relay,
+        1,
+        2,
+        lane,
+        "",
+    )
+    return ";".join(map(str, fields))
+
+
+def day_lines(config: SyntheticConfig, shot_date: date) -> List[str]:
+    """Every shot fired on ``shot_date``, in the order SIUS logs them."""
+    rng = random.Random(f"{config.seed}:{shot_date.isoformat()}")
+    shots = []
+    for lane, athlete_id in enumerate(config.athlete_ids, start=1):
+        seconds = 8 * 3600 + rng.uniform(0, 3600)
+        for shot in range(config.sighters + config.match_shots):
+            match_shot = int(shot >= config.sighters)
+            relay = (shot - config.sighters) // RELAY_SIZE + 1 if match_shot else 0
+            seconds += SECONDS_PER_SHOT + rng.uniform(0, 30)
+            shots.append((seconds, athlete_id, lane, match_shot, relay))
+    # Lanes fire in parallel, the range log interleaves them by time
+    shots.sort()
+    return [
+        shot_line(rng, config, athlete_id, lane, shot_date, seconds, match, relay, i)
+        for i, (seconds, athlete_id, lane, match, relay) in enumerate(shots)
+    ]
+
+
+def sius_files(config: SyntheticConfig) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(filename, content)`` of one SIUS log per day, oldest first."""
+    for shot_date in config.shot_dates:
+        content = "\n".join(day_lines(config, shot_date)) + "\n"
+        yield f"{shot_date:%Y%m%d}.csv", content.encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", type=Path, required=True)
+    types = {int: int, float: float, date: date.fromisoformat}
+    for name, field in SyntheticConfig.model_fields.items():
+        if field.annotation in types:
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=types[field.annotation],
+                default=field.default,
+            )
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        **{
+            name: getattr(args, name)
+            for name in SyntheticConfig.model_fields
+            if hasattr(args, name)
+        }
+    )
+    args.out.mkdir(parents=True, exist_ok=True)
+    for filename, content in sius_files(config):
+        (args.out / filename).write_bytes(content)
+    print(f"{config.days} files, {config.total_shots} shots written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()